@@ -1,7 +1,23 @@
+import importlib
+import typing
+
 from attack_surface_approximation.exceptions import (
     InputStreamsDetectorException,
 )
-from attack_surface_approximation.static_input_streams_detection import (
-    InputStreamsDetector,
-)
-from commons import mitigations
+
+# The heavy subsystems are only imported on first access.
+LAZY_ATTRIBUTES = {
+    "InputStreamsDetector": (
+        "attack_surface_approximation.static_input_streams_detection"
+    ),
+    "mitigations": "commons",
+}
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name not in LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(LAZY_ATTRIBUTES[name])
+
+    return getattr(module, name)
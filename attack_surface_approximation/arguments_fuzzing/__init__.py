@@ -3,6 +3,43 @@ from attack_surface_approximation.arguments_fuzzing.arguments_types import (
     ArgumentPlusFileArgument,
     ArgumentsPair,
     ArgumentStringArgument,
+    AttachedFileArgument,
+    AttachedStringArgument,
     NoneArgument,
 )
-from attack_surface_approximation.arguments_fuzzing.fuzzer import ArgumentsFuzzer
+from attack_surface_approximation.arguments_fuzzing.corpus import FuzzingCorpus
+from attack_surface_approximation.arguments_fuzzing.fuzzer import (
+    ArgumentsFuzzer,
+)
+from attack_surface_approximation.arguments_fuzzing.scheduler import (
+    FuzzingBudget,
+    FuzzingReport,
+)
+from attack_surface_approximation.arguments_fuzzing.distributed import (
+    FuzzingCoordinator,
+    FuzzingWorker,
+    LocalWorkers,
+)
+from attack_surface_approximation.arguments_fuzzing.execution_log import (
+    ExecutionFlag,
+    ExecutionLog,
+)
+from attack_surface_approximation.arguments_fuzzing.cassette import (
+    Cassette,
+    ReplayAnalysis,
+    SimulatedClock,
+)
+from attack_surface_approximation.arguments_fuzzing.fuzzing_plan import (
+    FuzzingPlan,
+    StaticProfile,
+)
+from attack_surface_approximation.arguments_fuzzing.differential import (
+    ArgumentsDelta,
+    BinaryDiff,
+    DifferentialRescan,
+    load_previous_arguments,
+)
+from attack_surface_approximation.arguments_fuzzing.environment_fuzzer import (
+    EnvironmentVariable,
+    EnvironmentVariablesFuzzer,
+)
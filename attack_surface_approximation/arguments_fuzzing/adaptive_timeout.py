@@ -0,0 +1,56 @@
+import typing
+
+from attack_surface_approximation.arguments_fuzzing.qbdi_analysis import (
+    QBDIAnalysisResult,
+)
+
+TIMEOUT_DECIMALS = 2
+
+
+class AdaptiveTimeout:
+    ceiling: float
+    floor: float
+    safety_margin: float
+    timeout: float
+    max_duration: typing.Optional[float]
+
+    def __init__(
+        self, ceiling: float, floor: float, safety_margin: float
+    ) -> None:
+        self.ceiling = ceiling
+        self.floor = floor
+        self.safety_margin = safety_margin
+        self.timeout = ceiling
+        self.max_duration = None
+
+    def __derive_timeout(self) -> float:
+        if self.max_duration is None:
+            return self.ceiling
+
+        timeout = self.max_duration * self.safety_margin
+        timeout = min(self.ceiling, max(self.floor, timeout))
+
+        return round(timeout, TIMEOUT_DECIMALS)
+
+    def calibrate(self, results: typing.Iterable[QBDIAnalysisResult]) -> float:
+        # Only the completed runs are relevant for the distribution, as the
+        # timed out ones only indicate that the ceiling was reached.
+        durations = [
+            result.duration for result in results if not result.is_timeout()
+        ]
+        self.max_duration = max(durations) if durations else None
+        self.timeout = self.__derive_timeout()
+
+        return self.timeout
+
+    def observe(self, result: QBDIAnalysisResult) -> float:
+        if not result.is_timeout() and (
+            self.max_duration is None or result.duration > self.max_duration
+        ):
+            self.max_duration = result.duration
+            self.timeout = max(self.timeout, self.__derive_timeout())
+
+        return self.timeout
+
+    def can_be_extended(self) -> bool:
+        return self.timeout < self.ceiling
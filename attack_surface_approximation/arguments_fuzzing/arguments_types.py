@@ -87,3 +87,51 @@ class ArgumentStringArgument(ArgumentsPair):
     ) -> None:
         if result.bbs_hash not in bbs_hashes_baseline:
             self.valid_roles.append(ArgumentRole.STRING_ENABLER)
+
+
+def attach_value(argument: str, value: str) -> str:
+    # getopt only reads an optional value from the same argv element, as in
+    # "-ovalue" or "--option=value".
+    if argument.startswith("--"):
+        return f"{argument}={value}"
+    else:
+        return argument + value
+
+
+class AttachedStringArgument(ArgumentStringArgument):
+    def to_str(self) -> str:
+        return attach_value(self.first, self.second)
+
+
+class AttachedFileArgument(ArgumentPlusFileArgument):
+    def to_str(self) -> str:
+        return attach_value(self.first, self.second)
+
+
+ARGUMENTS_TYPES = {
+    argument_type.__name__: argument_type
+    for argument_type in [
+        NoneArgument,
+        FileArgument,
+        ArgumentPlusFileArgument,
+        ArgumentArgument,
+        ArgumentStringArgument,
+        AttachedStringArgument,
+        AttachedFileArgument,
+    ]
+}
+
+
+def build_arguments_pair(
+    type_name: str,
+    first: typing.Optional[str],
+    second: typing.Optional[str],
+    roles: typing.Iterable[str],
+) -> ArgumentsPair:
+    constructor_arguments = [
+        value for value in [first, second] if value is not None
+    ]
+    argument = ARGUMENTS_TYPES[type_name](*constructor_arguments)
+    argument.valid_roles = [ArgumentRole[role] for role in roles if role]
+
+    return argument
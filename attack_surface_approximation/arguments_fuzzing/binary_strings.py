@@ -0,0 +1,25 @@
+import re
+import typing
+
+PRINTABLE_STRING_PATTERN = rb"[\x20-\x7e]{2,}"
+TOKEN_DELIMITERS_PATTERN = r"[\s,=\[\]()<>|\"'`;]+"
+TOKEN_TRAILING_CHARACTERS = ".:"
+
+
+def extract_strings(filename: str) -> typing.Generator[str, None, None]:
+    with open(filename, "rb") as binary:
+        content = binary.read()
+
+    for string in re.findall(PRINTABLE_STRING_PATTERN, content):
+        yield string.decode("ascii")
+
+
+def extract_tokens(filename: str) -> typing.Set[str]:
+    tokens = set()
+    for string in extract_strings(filename):
+        for token in re.split(TOKEN_DELIMITERS_PATTERN, string):
+            token = token.rstrip(TOKEN_TRAILING_CHARACTERS)
+            if token:
+                tokens.add(token)
+
+    return tokens
@@ -0,0 +1,175 @@
+import json
+import time
+import typing
+
+from attack_surface_approximation.arguments_fuzzing.arguments_types import (
+    ArgumentsPair,
+)
+from attack_surface_approximation.arguments_fuzzing.qbdi_analysis import (
+    TIMEOUT_EXIT_CODE,
+    QBDIAnalysisResult,
+)
+from attack_surface_approximation.configuration import Configuration
+from attack_surface_approximation.exceptions import CassetteMissException
+
+CassetteKey = typing.Tuple[typing.Optional[str], ...]
+
+
+def get_cassette_key(
+    argument: ArgumentsPair,
+    environment: typing.Optional[typing.Dict[str, str]] = None,
+) -> CassetteKey:
+    # The environment variables set for the run are part of the key, as
+    # "NAME=value" assignments following the argument.
+    assignments = tuple(
+        f"{name}={value}"
+        for name, value in sorted((environment or {}).items())
+    )
+
+    return (type(argument).__name__, argument.first, argument.second) + (
+        assignments
+    )
+
+
+class Cassette:
+    filename: str
+    __cassette_file: typing.TextIO
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self.__cassette_file = open(  # pylint: disable=consider-using-with
+            filename, "w", encoding="utf-8"
+        )
+
+    def record(
+        self,
+        argument: ArgumentsPair,
+        result: QBDIAnalysisResult,
+        timeout: float,
+        environment: typing.Optional[typing.Dict[str, str]] = None,
+    ) -> None:
+        entry = {
+            "argument": get_cassette_key(argument, environment),
+            "timeout": timeout,
+            "bbs_count": result.bbs_count,
+            "bbs_hash": result.bbs_hash,
+            "uses_file": result.uses_file,
+            "exit_code": result.exit_code,
+            "uses_stdin": result.uses_stdin,
+            "duration": result.duration,
+            "harvested_strings": result.harvested_strings,
+            "environment_variables": result.environment_variables,
+        }
+
+        # Each line is flushed, so an interrupted recording is still usable.
+        self.__cassette_file.write(json.dumps(entry) + "\n")
+        self.__cassette_file.flush()
+
+    def close(self) -> None:
+        self.__cassette_file.close()
+
+    @staticmethod
+    def read(filename: str) -> typing.Dict[CassetteKey, typing.List[dict]]:
+        entries = {}
+        with open(filename, "r", encoding="utf-8") as cassette_file:
+            for line in cassette_file:
+                entry = json.loads(line)
+                key = tuple(entry.pop("argument"))
+
+                entries.setdefault(key, []).append(entry)
+
+        return entries
+
+
+class SimulatedClock:
+    time: float
+
+    def __init__(self) -> None:
+        self.time = 0
+
+    def __call__(self) -> float:
+        return self.time
+
+    def advance(self, seconds: float) -> None:
+        self.time += seconds
+
+
+class ReplayAnalysis:
+    executable_filename: str
+    timeout: float
+    executions: int
+    clock: SimulatedClock
+    speedup: typing.Optional[float]
+    __entries: typing.Dict[CassetteKey, typing.List[dict]]
+
+    def __init__(
+        self,
+        cassette_filename: str,
+        timeout: float,
+        executable_filename: str = "",
+        speedup: typing.Optional[float] = None,
+    ) -> None:
+        self.executable_filename = executable_filename
+        self.timeout = timeout
+        self.executions = 0
+        self.clock = SimulatedClock()
+        self.speedup = speedup
+        self.__entries = Cassette.read(cassette_filename)
+
+    def create_temp_file_inside_container(self) -> str:
+        return Configuration.QBDIAnalysis.CONTAINER_TEMP_FILE
+
+    def __get_entry(
+        self,
+        argument: ArgumentsPair,
+        environment: typing.Optional[typing.Dict[str, str]],
+    ) -> dict:
+        try:
+            entries = self.__entries[get_cassette_key(argument, environment)]
+        except KeyError as exception:
+            raise CassetteMissException(argument.to_str()) from exception
+
+        # The run recorded with the longest timeout is the most informative
+        # one, for example the confirmation of a suspicious timeout.
+        return max(entries, key=lambda entry: entry["timeout"])
+
+    def __build_timeout_result(self) -> QBDIAnalysisResult:
+        # As in a real run, the tracer writes no results for a killed program
+        # and the retry with a fed standard input times out too.
+        return QBDIAnalysisResult(
+            None, None, None, TIMEOUT_EXIT_CODE, False, self.timeout
+        )
+
+    def analyze(
+        self,
+        argument: ArgumentsPair,
+        environment: typing.Optional[typing.Dict[str, str]] = None,
+    ) -> QBDIAnalysisResult:
+        entry = self.__get_entry(argument, environment)
+
+        if entry["exit_code"] != TIMEOUT_EXIT_CODE and (
+            entry["duration"] > self.timeout
+        ):
+            result = self.__build_timeout_result()
+        else:
+            result = QBDIAnalysisResult(
+                entry["bbs_count"],
+                entry["bbs_hash"],
+                entry["uses_file"],
+                entry["exit_code"],
+                entry["uses_stdin"],
+                min(entry["duration"], self.timeout),
+                entry.get("harvested_strings"),
+                entry.get("environment_variables"),
+            )
+
+        # As in a real run, a timeout is retried with a fed standard input.
+        self.executions += 2 if result.is_timeout() else 1
+
+        # The time passes only on the simulated clock, unless the replay is
+        # slowed down to an accelerated real time.
+        self.clock.advance(result.duration)
+        if self.speedup:
+            time.sleep(result.duration / self.speedup)
+
+        return result
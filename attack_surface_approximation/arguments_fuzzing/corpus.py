@@ -0,0 +1,198 @@
+import hashlib
+import sqlite3
+import typing
+
+from attack_surface_approximation.arguments_fuzzing.arguments_types import (
+    ArgumentsPair,
+    build_arguments_pair,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS baseline_hashes (
+    binary_id TEXT NOT NULL,
+    bbs_hash INTEGER,
+    UNIQUE (binary_id, bbs_hash)
+);
+CREATE TABLE IF NOT EXISTS seen_hashes (
+    binary_id TEXT NOT NULL,
+    bbs_hash INTEGER,
+    UNIQUE (binary_id, bbs_hash)
+);
+CREATE TABLE IF NOT EXISTS tried_arguments (
+    binary_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    first TEXT NOT NULL,
+    second TEXT NOT NULL,
+    UNIQUE (binary_id, type, first, second)
+);
+CREATE INDEX IF NOT EXISTS tried_entries ON tried_arguments (binary_id, first);
+CREATE TABLE IF NOT EXISTS valid_arguments (
+    binary_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    first TEXT,
+    second TEXT,
+    roles TEXT NOT NULL
+);
+"""
+HASH_BLOCK_SIZE = 1 << 16
+
+
+class FuzzingCorpus:
+    __connection: sqlite3.Connection
+    binary_id: str
+
+    def __init__(
+        self, database_filename: str, executable_filename: str
+    ) -> None:
+        self.binary_id = self.compute_binary_id(executable_filename)
+
+        self.__connection = sqlite3.connect(database_filename)
+        self.__connection.executescript(SCHEMA)
+
+    @staticmethod
+    def compute_binary_id(executable_filename: str) -> str:
+        digest = hashlib.sha256()
+        with open(executable_filename, "rb") as executable:
+            for block in iter(lambda: executable.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+
+        return digest.hexdigest()
+
+    def __get_hashes(self, table: str) -> typing.List[typing.Optional[int]]:
+        rows = self.__connection.execute(
+            f"SELECT bbs_hash FROM {table} WHERE binary_id = ?",
+            (self.binary_id,),
+        )
+
+        return [bbs_hash for (bbs_hash,) in rows]
+
+    def __add_hashes(
+        self, table: str, bbs_hashes: typing.Iterable[typing.Optional[int]]
+    ) -> None:
+        # The hashes are signed 64-bit integers and the missing results are
+        # stored as NULL values, which the UNIQUE constraint does not
+        # deduplicate, hence the explicit check.
+        self.__connection.executemany(
+            (
+                f"INSERT INTO {table} (binary_id, bbs_hash) SELECT ?, ? WHERE"
+                f" NOT EXISTS (SELECT 1 FROM {table} WHERE binary_id = ? AND"
+                " bbs_hash IS ?)"
+            ),
+            (
+                (self.binary_id, bbs_hash, self.binary_id, bbs_hash)
+                for bbs_hash in bbs_hashes
+            ),
+        )
+
+    def get_baseline_hashes(self) -> typing.List[typing.Optional[int]]:
+        return self.__get_hashes("baseline_hashes")
+
+    def add_baseline_hashes(
+        self, bbs_hashes: typing.Iterable[typing.Optional[int]]
+    ) -> None:
+        self.__add_hashes("baseline_hashes", bbs_hashes)
+
+    def get_seen_hashes(self) -> typing.List[typing.Optional[int]]:
+        return self.__get_hashes("seen_hashes")
+
+    def add_seen_hash(self, bbs_hash: typing.Optional[int]) -> None:
+        self.__add_hashes("seen_hashes", [bbs_hash])
+
+    @staticmethod
+    def __get_argument_key(argument: ArgumentsPair) -> typing.Tuple[str, ...]:
+        return (
+            type(argument).__name__,
+            argument.first or "",
+            argument.second or "",
+        )
+
+    def is_tried(self, argument: ArgumentsPair) -> bool:
+        row = self.__connection.execute(
+            (
+                "SELECT 1 FROM tried_arguments WHERE binary_id = ? AND type ="
+                " ? AND first = ? AND second = ?"
+            ),
+            (self.binary_id, *self.__get_argument_key(argument)),
+        ).fetchone()
+
+        return row is not None
+
+    def has_results(self) -> bool:
+        row = self.__connection.execute(
+            "SELECT 1 FROM baseline_hashes WHERE binary_id = ? LIMIT 1",
+            (self.binary_id,),
+        ).fetchone()
+
+        return row is not None
+
+    def get_tried_watermark(self) -> int:
+        (watermark,) = self.__connection.execute(
+            "SELECT COALESCE(MAX(rowid), 0) FROM tried_arguments"
+        ).fetchone()
+
+        return watermark
+
+    def is_entry_tried(
+        self, dictionary_entry: str, watermark: typing.Optional[int] = None
+    ) -> bool:
+        # The watermark restricts the check to the candidates that were tried
+        # before it was taken, such that the answer is stable during a run.
+        if watermark is None:
+            watermark = self.get_tried_watermark()
+
+        row = self.__connection.execute(
+            (
+                "SELECT 1 FROM tried_arguments WHERE binary_id = ? AND first ="
+                " ? AND rowid <= ?"
+            ),
+            (self.binary_id, dictionary_entry, watermark),
+        ).fetchone()
+
+        return row is not None
+
+    def mark_tried(self, argument: ArgumentsPair) -> None:
+        self.__connection.execute(
+            (
+                "INSERT OR IGNORE INTO tried_arguments (binary_id, type,"
+                " first, second) VALUES (?, ?, ?, ?)"
+            ),
+            (self.binary_id, *self.__get_argument_key(argument)),
+        )
+
+    def get_valid_arguments(self) -> typing.List[ArgumentsPair]:
+        rows = self.__connection.execute(
+            (
+                "SELECT type, first, second, roles FROM valid_arguments WHERE"
+                " binary_id = ? ORDER BY rowid"
+            ),
+            (self.binary_id,),
+        )
+
+        return [
+            build_arguments_pair(type_name, first, second, roles.split(","))
+            for type_name, first, second, roles in rows
+        ]
+
+    def add_valid_argument(self, argument: ArgumentsPair) -> None:
+        roles = ",".join(role.name for role in argument.valid_roles)
+
+        self.__connection.execute(
+            (
+                "INSERT INTO valid_arguments (binary_id, type, first, second,"
+                " roles) VALUES (?, ?, ?, ?, ?)"
+            ),
+            (
+                self.binary_id,
+                type(argument).__name__,
+                argument.first,
+                argument.second,
+                roles,
+            ),
+        )
+
+    def commit(self) -> None:
+        self.__connection.commit()
+
+    def close(self) -> None:
+        self.__connection.commit()
+        self.__connection.close()
@@ -0,0 +1,239 @@
+import hashlib
+import typing
+
+from attack_surface_approximation.arguments_fuzzing.arguments_types import (
+    ArgumentsPair,
+    FileArgument,
+)
+from attack_surface_approximation.arguments_fuzzing.binary_strings import (
+    extract_tokens,
+)
+from attack_surface_approximation.arguments_fuzzing.corpus import (
+    FuzzingCorpus,
+)
+from attack_surface_approximation.arguments_fuzzing.fuzzer import (
+    ArgumentsFuzzer,
+)
+from attack_surface_approximation.arguments_fuzzing.scheduler import (
+    FuzzingReport,
+)
+from attack_surface_approximation.exceptions import (
+    PreviousResultsNotFoundException,
+)
+from attack_surface_approximation.tracing import trace_span
+
+SAMPLE_RATE = 0.05
+MIN_SYMBOL_MATCH_LENGTH = 3
+SYMBOLS_SEPARATOR = "\n"
+
+ArgumentKey = typing.Tuple[str, typing.Optional[str], typing.Optional[str]]
+
+
+def extract_symbols(filename: str) -> typing.Dict[str, int]:
+    # pylint: disable=import-outside-toplevel
+    from elftools.elf.elffile import ELFFile
+    from elftools.elf.sections import SymbolTableSection
+
+    symbols = {}
+    with open(filename, "rb") as elf_file:
+        for section in ELFFile(elf_file).iter_sections():
+            if not isinstance(section, SymbolTableSection):
+                continue
+
+            for symbol in section.iter_symbols():
+                if symbol.name:
+                    symbols[symbol.name] = symbol["st_size"]
+
+    return symbols
+
+
+class BinaryDiff:
+    added_tokens: typing.Set[str]
+    removed_tokens: typing.Set[str]
+    changed_symbols: typing.Set[str]
+    __changed_symbols_text: str
+
+    def __init__(self, previous_filename: str, current_filename: str) -> None:
+        previous_tokens = extract_tokens(previous_filename)
+        current_tokens = extract_tokens(current_filename)
+        self.added_tokens = current_tokens - previous_tokens
+        self.removed_tokens = previous_tokens - current_tokens
+
+        # A function whose size changed was (most likely) modified.
+        previous_symbols = extract_symbols(previous_filename)
+        current_symbols = extract_symbols(current_filename)
+        self.changed_symbols = {
+            name
+            for name in previous_symbols.keys() | current_symbols.keys()
+            if previous_symbols.get(name) != current_symbols.get(name)
+        }
+        self.__changed_symbols_text = SYMBOLS_SEPARATOR.join(
+            self.changed_symbols
+        ).lower()
+
+    def is_tied_to_changes(self, dictionary_entry: str) -> bool:
+        if (
+            dictionary_entry in self.added_tokens
+            or dictionary_entry in self.removed_tokens  # noqa: W503
+        ):
+            return True
+
+        # An option is usually handled by functions or variables named after
+        # it, for example --dry-run by do_dry_run().
+        name = dictionary_entry.lstrip("-").replace("-", "_").lower()
+
+        return (
+            len(name) >= MIN_SYMBOL_MATCH_LENGTH
+            and name in self.__changed_symbols_text  # noqa: W503
+        )
+
+
+class ArgumentsDelta:
+    gained: typing.List[ArgumentsPair]
+    lost: typing.List[ArgumentsPair]
+    kept: typing.List[ArgumentsPair]
+
+    def __init__(
+        self,
+        previous_arguments: typing.List[ArgumentsPair],
+        current_arguments: typing.List[ArgumentsPair],
+    ) -> None:
+        previous_keys = {get_argument_key(arg) for arg in previous_arguments}
+        current_keys = {get_argument_key(arg) for arg in current_arguments}
+
+        self.gained = [
+            argument
+            for argument in current_arguments
+            if get_argument_key(argument) not in previous_keys
+        ]
+        self.lost = [
+            argument
+            for argument in previous_arguments
+            if get_argument_key(argument) not in current_keys
+        ]
+        self.kept = [
+            argument
+            for argument in current_arguments
+            if get_argument_key(argument) in previous_keys
+        ]
+
+
+def get_argument_key(argument: ArgumentsPair) -> ArgumentKey:
+    return (type(argument).__name__, argument.first, argument.second)
+
+
+class DifferentialRescan:
+    executable_filename: str
+    previous_arguments: typing.List[ArgumentsPair]
+    corpus: typing.Optional[FuzzingCorpus]
+    sample_rate: float
+    binary_id: str
+    diff: BinaryDiff
+    rechecked_entries: int
+    tied_entries: int
+    sampled_entries: int
+    dictionary_entries: int
+    fuzzer: typing.Optional[ArgumentsFuzzer]
+
+    def __init__(
+        self,
+        executable_filename: str,
+        previous_executable_filename: str,
+        previous_arguments: typing.List[ArgumentsPair],
+        corpus: typing.Optional[FuzzingCorpus] = None,
+        sample_rate: float = SAMPLE_RATE,
+    ) -> None:
+        self.executable_filename = executable_filename
+        self.previous_arguments = previous_arguments
+        self.corpus = corpus
+        self.sample_rate = sample_rate
+        self.binary_id = FuzzingCorpus.compute_binary_id(executable_filename)
+        self.fuzzer = None
+        self.rechecked_entries = 0
+        self.tied_entries = 0
+        self.sampled_entries = 0
+        self.dictionary_entries = 0
+
+        with trace_span("DifferentialRescan.diff"):
+            self.diff = BinaryDiff(
+                previous_executable_filename, executable_filename
+            )
+
+    def __is_sampled(self, dictionary_entry: str) -> bool:
+        # The sample is deterministic for a build, but differs from a build to
+        # another, so successive rescans cover different entries.
+        digest = hashlib.blake2b(
+            (self.binary_id + dictionary_entry).encode(
+                "utf-8", errors="surrogatepass"
+            ),
+            digest_size=8,
+        ).digest()
+
+        return int.from_bytes(digest, "little") / 2**64 < self.sample_rate
+
+    def select_entries(
+        self, dictionary: typing.Iterable[str]
+    ) -> typing.List[str]:
+        # The entries of the previously valid arguments are re-checked first.
+        rechecked_entries = list(
+            dict.fromkeys(
+                argument.first
+                for argument in self.previous_arguments
+                if not isinstance(argument, FileArgument)
+            )
+        )
+        selected_entries = set(rechecked_entries)
+        self.rechecked_entries = len(rechecked_entries)
+
+        other_entries = []
+        for entry in dictionary:
+            self.dictionary_entries += 1
+            if entry in selected_entries:
+                continue
+
+            if self.diff.is_tied_to_changes(entry):
+                self.tied_entries += 1
+            elif self.__is_sampled(entry):
+                self.sampled_entries += 1
+            else:
+                continue
+
+            selected_entries.add(entry)
+            other_entries.append(entry)
+
+        return rechecked_entries + other_entries
+
+    def run(
+        self, dictionary: typing.Iterable[str], **fuzzer_arguments: typing.Any
+    ) -> ArgumentsDelta:
+        with trace_span("DifferentialRescan.select_entries"):
+            entries = self.select_entries(dictionary)
+
+        self.fuzzer = ArgumentsFuzzer(
+            self.executable_filename,
+            entries,
+            corpus=self.corpus,
+            **fuzzer_arguments,
+        )
+        current_arguments = self.fuzzer.get_all_valid_arguments()
+
+        return ArgumentsDelta(self.previous_arguments, current_arguments)
+
+    def get_report(self) -> FuzzingReport:
+        return self.fuzzer.get_report()
+
+
+def load_previous_arguments(
+    database_filename: str, previous_executable_filename: str
+) -> typing.List[ArgumentsPair]:
+    previous_corpus = FuzzingCorpus(
+        database_filename, previous_executable_filename
+    )
+
+    try:
+        if not previous_corpus.has_results():
+            raise PreviousResultsNotFoundException()
+
+        return previous_corpus.get_valid_arguments()
+    finally:
+        previous_corpus.close()
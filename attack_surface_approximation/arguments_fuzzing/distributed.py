@@ -0,0 +1,356 @@
+import math
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
+import typing
+from multiprocessing.connection import Client, Connection, Listener
+
+from attack_surface_approximation.arguments_fuzzing.arguments_types import (
+    ArgumentPlusFileArgument,
+    ArgumentsPair,
+    AttachedFileArgument,
+    FileArgument,
+    build_arguments_pair,
+)
+from attack_surface_approximation.arguments_fuzzing.fuzzer import (
+    ANALYSIS_TIMEOUT,
+    ArgumentsFuzzer,
+)
+from attack_surface_approximation.arguments_fuzzing.qbdi_analysis import (
+    QBDIAnalysis,
+    QBDIAnalysisResult,
+)
+from attack_surface_approximation.exceptions import WorkerFailedException
+
+WORKING_FOLDER_PREFIX = "qbdi-worker-"
+HOST_FOLDER_NAME = "qbdi"
+LOCAL_HOST = "127.0.0.1"
+
+# Type name, first and second members, roles' names and coverage hash
+Observation = typing.Tuple[
+    str,
+    typing.Optional[str],
+    typing.Optional[str],
+    typing.List[str],
+    typing.Optional[int],
+]
+
+
+def parse_address(address: str) -> typing.Tuple[str, int]:
+    host, _, port = address.rpartition(":")
+
+    return (host or LOCAL_HOST, int(port))
+
+
+class FuzzingWorker:
+    address: typing.Tuple[str, int]
+    authkey: bytes
+    docker_host: typing.Optional[str]
+
+    def __init__(
+        self,
+        address: typing.Tuple[str, int],
+        authkey: bytes,
+        docker_host: typing.Optional[str] = None,
+    ) -> None:
+        self.address = address
+        self.authkey = authkey
+        self.docker_host = docker_host
+
+    def create_analysis(
+        self, executable_filename: str, host_folder: str
+    ) -> QBDIAnalysis:
+        return QBDIAnalysis(
+            executable_filename,
+            ANALYSIS_TIMEOUT,
+            host_folder=host_folder,
+            docker_host=self.docker_host,
+        )
+
+    def fuzz(
+        self, name: str, executable: bytes, dictionary: typing.List[str]
+    ) -> typing.List[Observation]:
+        observations = []
+
+        def observe(
+            argument: ArgumentsPair,
+            result: QBDIAnalysisResult,
+            is_baseline: bool,
+        ) -> None:
+            if not is_baseline:
+                observations.append(
+                    (
+                        type(argument).__name__,
+                        argument.first,
+                        argument.second,
+                        [role.name for role in argument.valid_roles],
+                        result.bbs_hash,
+                    )
+                )
+
+        # Each job has its own host folder, so the jobs of the workers sharing
+        # a Docker host do not overwrite each other's executable and results.
+        with tempfile.TemporaryDirectory(
+            prefix=WORKING_FOLDER_PREFIX
+        ) as working_folder:
+            executable_filename = os.path.join(
+                working_folder, os.path.basename(name)
+            )
+            with open(executable_filename, "wb") as executable_file:
+                executable_file.write(executable)
+
+            analysis = self.create_analysis(
+                executable_filename,
+                os.path.join(working_folder, HOST_FOLDER_NAME),
+            )
+            fuzzer = ArgumentsFuzzer(
+                executable_filename,
+                dictionary,
+                analysis=analysis,
+                on_analysis=observe,
+            )
+            fuzzer.get_all_valid_arguments()
+
+        return observations
+
+    def __handle(self, connection: Connection) -> None:
+        job = connection.recv()
+
+        try:
+            observations = self.fuzz(
+                job["name"], job["executable"], job["dictionary"]
+            )
+        except Exception as exception:  # pylint: disable=broad-except
+            connection.send({"error": repr(exception)})
+        else:
+            connection.send({"observations": observations})
+
+    def serve_forever(
+        self, on_ready: typing.Optional[typing.Callable] = None
+    ) -> None:
+        with Listener(self.address, authkey=self.authkey) as listener:
+            if on_ready:
+                on_ready(listener.address)
+
+            while True:
+                with listener.accept() as connection:
+                    try:
+                        self.__handle(connection)
+                    except (EOFError, OSError):
+                        continue
+
+
+class FuzzingCoordinator:
+    addresses: typing.List[typing.Tuple[str, int]]
+    authkey: bytes
+
+    def __init__(
+        self,
+        addresses: typing.List[typing.Tuple[str, int]],
+        authkey: bytes,
+    ) -> None:
+        self.addresses = addresses
+        self.authkey = authkey
+
+    def __run_job(
+        self,
+        address: typing.Tuple[str, int],
+        executable_filename: str,
+        dictionary: typing.List[str],
+    ) -> typing.List[Observation]:
+        with open(executable_filename, "rb") as executable_file:
+            executable = executable_file.read()
+
+        try:
+            with Client(address, authkey=self.authkey) as connection:
+                connection.send(
+                    {
+                        "name": os.path.basename(executable_filename),
+                        "executable": executable,
+                        "dictionary": dictionary,
+                    }
+                )
+                response = connection.recv()
+        except (EOFError, OSError) as exception:
+            raise WorkerFailedException() from exception
+
+        if "error" in response:
+            raise WorkerFailedException(response["error"])
+
+        return response["observations"]
+
+    @staticmethod
+    def __get_phase(observation: Observation) -> int:
+        # The candidates are generated by each worker in the same phases as in
+        # a sequential run: the file argument, the arguments followed by a
+        # filename and finally the flags (optionally followed by a string).
+        type_name = observation[0]
+        if type_name == FileArgument.__name__:
+            return 0
+        if type_name in (
+            ArgumentPlusFileArgument.__name__,
+            AttachedFileArgument.__name__,
+        ):
+            return 1
+
+        return 2
+
+    @staticmethod
+    def merge(
+        shards_observations: typing.List[typing.List[Observation]],
+    ) -> typing.List[ArgumentsPair]:
+        ordered_observations = sorted(
+            (
+                (FuzzingCoordinator.__get_phase(observation), shard, position)
+                + (observation,)
+                for shard, observations in enumerate(shards_observations)
+                for position, observation in enumerate(observations)
+            ),
+            key=lambda entry: entry[:3],
+        )
+
+        # The same deduplication as in a sequential run: an argument is valid
+        # only if its coverage hash was not produced by a previous candidate.
+        valid_arguments = []
+        tried_candidates = set()
+        old_hashes = set()
+        for *_, observation in ordered_observations:
+            type_name, first, second, roles, bbs_hash = observation
+
+            # The candidates not depending on the dictionary (namely the file
+            # argument and the standard input one) are tried by all workers.
+            candidate = (type_name, first, second)
+            if candidate in tried_candidates:
+                continue
+            tried_candidates.add(candidate)
+
+            if roles and bbs_hash not in old_hashes:
+                valid_arguments.append(
+                    build_arguments_pair(type_name, first, second, roles)
+                )
+            old_hashes.add(bbs_hash)
+
+        return valid_arguments
+
+    @staticmethod
+    def shard(
+        dictionary: typing.List[str], shards_count: int
+    ) -> typing.List[typing.List[str]]:
+        # Contiguous shards keep the order of a sequential run when merged.
+        shard_size = max(1, math.ceil(len(dictionary) / shards_count))
+
+        return [
+            dictionary[start : start + shard_size]
+            for start in range(0, len(dictionary), shard_size)
+        ] or [[]]
+
+    def __run_in_parallel(
+        self, jobs: "queue.Queue", results: typing.Dict
+    ) -> None:
+        failures = []
+
+        def consume(address: typing.Tuple[str, int]) -> None:
+            while not failures:
+                try:
+                    key, executable_filename, dictionary = jobs.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    results[key] = self.__run_job(
+                        address, executable_filename, dictionary
+                    )
+                except WorkerFailedException as exception:
+                    failures.append(exception)
+
+        threads = [
+            threading.Thread(target=consume, args=(address,))
+            for address in self.addresses
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if failures:
+            raise failures[0]
+
+    def fuzz(
+        self, executable_filename: str, dictionary: typing.Iterable[str]
+    ) -> typing.List[ArgumentsPair]:
+        shards = self.shard(list(dictionary), len(self.addresses))
+
+        jobs = queue.Queue()
+        for index, shard in enumerate(shards):
+            jobs.put((index, executable_filename, shard))
+
+        results = {}
+        self.__run_in_parallel(jobs, results)
+
+        return self.merge([results[index] for index in range(len(shards))])
+
+    def fuzz_many(
+        self,
+        executable_filenames: typing.List[str],
+        dictionary: typing.Iterable[str],
+    ) -> typing.Dict[str, typing.List[ArgumentsPair]]:
+        dictionary = list(dictionary)
+
+        # Each executable is fuzzed entirely by the first available worker.
+        jobs = queue.Queue()
+        for executable_filename in executable_filenames:
+            jobs.put((executable_filename, executable_filename, dictionary))
+
+        results = {}
+        self.__run_in_parallel(jobs, results)
+
+        return {
+            executable_filename: self.merge([results[executable_filename]])
+            for executable_filename in executable_filenames
+        }
+
+
+def run_worker(
+    worker: FuzzingWorker, addresses: "multiprocessing.Queue"
+) -> None:
+    worker.serve_forever(on_ready=addresses.put)
+
+
+class LocalWorkers:
+    processes: typing.List[multiprocessing.Process]
+    addresses: typing.List[typing.Tuple[str, int]]
+
+    def __init__(
+        self,
+        count: int,
+        authkey: bytes,
+        worker_class: typing.Type[FuzzingWorker] = FuzzingWorker,
+    ) -> None:
+        # The workers listen on ports chosen by the operating system, which
+        # are reported back once they are ready.
+        addresses = multiprocessing.Queue()
+        self.processes = [
+            multiprocessing.Process(
+                target=run_worker,
+                args=(worker_class((LOCAL_HOST, 0), authkey), addresses),
+                daemon=True,
+            )
+            for _ in range(count)
+        ]
+        for process in self.processes:
+            process.start()
+
+        self.addresses = [addresses.get() for _ in self.processes]
+
+    def close(self) -> None:
+        for process in self.processes:
+            process.terminate()
+            process.join()
+
+    def __enter__(self) -> "LocalWorkers":
+        return self
+
+    def __exit__(self, *_: typing.Any) -> None:
+        self.close()
@@ -0,0 +1,154 @@
+import typing
+
+from commons.arguments import ArgumentRole
+
+from attack_surface_approximation.arguments_fuzzing.arguments_types import (
+    NoneArgument,
+)
+from attack_surface_approximation.arguments_fuzzing.fuzzer import (
+    ANALYSIS_TIMEOUT,
+    CANARY_STRING,
+)
+from attack_surface_approximation.arguments_fuzzing.harvested_strings import (
+    ENVIRONMENT_VARIABLE_PATTERN,
+)
+from attack_surface_approximation.arguments_fuzzing.qbdi_analysis import (
+    QBDIAnalysis,
+    QBDIAnalysisResult,
+)
+from attack_surface_approximation.exceptions import (
+    InvalidEnvironmentVariableException,
+)
+from attack_surface_approximation.tracing import trace_span
+
+FLAG_VALUE = "1"
+BASELINE_RUNS_COUNT = 3
+
+
+class EnvironmentVariable:
+    name: str
+    valid_roles: typing.List[ArgumentRole]
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.valid_roles = []
+
+    def to_str(self) -> str:
+        return self.name
+
+
+class EnvironmentVariablesFuzzer:
+    executable_filename: str
+    analysis: QBDIAnalysis
+    variables: typing.List[str]
+    canary_filename: str
+    baseline_hashes: typing.List[int]
+    old_hashes: typing.List[int]
+    valid_variables: typing.List[EnvironmentVariable]
+    executions: int
+
+    def __init__(
+        self,
+        executable_filename: str,
+        variables: typing.Optional[typing.Iterable[str]] = None,
+        analysis: typing.Optional[QBDIAnalysis] = None,
+    ) -> None:
+        # The names are part of the executed shell command.
+        for name in variables or []:
+            if not ENVIRONMENT_VARIABLE_PATTERN.fullmatch(name):
+                raise InvalidEnvironmentVariableException(name)
+
+        self.executable_filename = executable_filename
+        self.valid_variables = []
+        self.old_hashes = []
+        self.executions = 0
+
+        # The analysis of an arguments' fuzzing can be reused, with its
+        # calibrated timeout.
+        if analysis:
+            self.analysis = analysis
+        else:
+            self.analysis = QBDIAnalysis(
+                self.executable_filename, ANALYSIS_TIMEOUT
+            )
+        self.canary_filename = (
+            self.analysis.create_temp_file_inside_container()
+        )
+
+        # The baseline is run multiple times, such that a nondeterministic
+        # coverage is not mistaken for the effect of a variable.
+        with trace_span("EnvironmentVariablesFuzzer.baseline"):
+            baseline_results = [
+                self.__analyze({}) for _ in range(BASELINE_RUNS_COUNT)
+            ]
+        self.baseline_hashes = [result.bbs_hash for result in baseline_results]
+
+        # The variables read by the baseline runs are fuzzed after the already
+        # known ones.
+        baseline_variables = [
+            name
+            for result in baseline_results
+            for name in result.environment_variables
+        ]
+        self.variables = list(
+            dict.fromkeys(list(variables or []) + baseline_variables)
+        )
+
+    def __analyze(
+        self, environment: typing.Dict[str, str]
+    ) -> QBDIAnalysisResult:
+        executions = self.analysis.executions
+        with trace_span(
+            "QBDIAnalysis.analyze",
+            profile=False,
+            environment=" ".join(environment),
+        ):
+            result = self.analysis.analyze(
+                NoneArgument(), environment=environment
+            )
+        self.executions += self.analysis.executions - executions
+
+        return result
+
+    def __is_new_hash(self, result: QBDIAnalysisResult) -> bool:
+        return (
+            result.bbs_hash not in self.baseline_hashes
+            and result.bbs_hash not in self.old_hashes  # noqa: W503
+        )
+
+    def __attach_roles(self, variable: EnvironmentVariable) -> None:
+        # As for the arguments, a flag-like value is tried first, then a
+        # string one, whose coverage needs to differ from the flag's one.
+        result = self.__analyze({variable.name: FLAG_VALUE})
+        if result.uses_stdin:
+            variable.valid_roles.append(ArgumentRole.STDIN_ENABLER)
+        if self.__is_new_hash(result):
+            variable.valid_roles.append(ArgumentRole.FLAG)
+        self.old_hashes.append(result.bbs_hash)
+
+        result = self.__analyze({variable.name: CANARY_STRING})
+        if self.__is_new_hash(result):
+            variable.valid_roles.append(ArgumentRole.STRING_ENABLER)
+        self.old_hashes.append(result.bbs_hash)
+
+        result = self.__analyze({variable.name: self.canary_filename})
+        if result.uses_file:
+            variable.valid_roles.append(ArgumentRole.FILE_ENABLER)
+
+    def get_valid_variable(
+        self,
+    ) -> typing.Generator[EnvironmentVariable, None, None]:
+        # As for the arguments, the span is the wall-clock time of the
+        # suspended generator too, so it is not profiled.
+        with trace_span("EnvironmentVariablesFuzzer.fuzz", profile=False):
+            for name in self.variables:
+                variable = EnvironmentVariable(name)
+                self.__attach_roles(variable)
+
+                if variable.valid_roles:
+                    self.valid_variables.append(variable)
+
+                    yield variable
+
+    def get_all_valid_variables(self) -> typing.List[EnvironmentVariable]:
+        return list(self.get_valid_variable())
@@ -0,0 +1,241 @@
+import array
+import enum
+import json
+import struct
+import sys
+import typing
+
+from attack_surface_approximation.arguments_fuzzing.arguments_types import (
+    ArgumentsPair,
+)
+from attack_surface_approximation.arguments_fuzzing.qbdi_analysis import (
+    QBDIAnalysisResult,
+)
+from attack_surface_approximation.exceptions import (
+    InvalidExecutionLogException,
+)
+
+MAGIC = b"QBDILOG1"
+CHUNK_HEADER = struct.Struct("<II")
+DEFAULT_CHUNK_SIZE = 65536
+
+# Column names and their array typecodes
+COLUMNS = {
+    "argument_id": "I",
+    "bbs_count": "I",
+    "bbs_hash": "q",
+    "exit_code": "i",
+    "flags": "B",
+    "duration": "f",
+}
+
+Columns = typing.Dict[str, array.array]
+
+
+class ExecutionFlag(enum.IntFlag):
+    USES_FILE = 1
+    USES_STDIN = 2
+    TIMEOUT = 4
+    BASELINE = 8
+    HAS_ROLES = 16
+    MISSING_RESULT = 32
+
+
+def create_empty_columns() -> Columns:
+    return {name: array.array(typecode) for name, typecode in COLUMNS.items()}
+
+
+class ExecutionLog:
+    filename: typing.Optional[str]
+    chunk_size: int
+    arguments: typing.List[str]
+    records_count: int
+    __arguments_ids: typing.Dict[str, int]
+    __flushed_arguments_count: int
+    __buffer: Columns
+
+    def __init__(
+        self,
+        filename: typing.Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.arguments = []
+        self.records_count = 0
+        self.__arguments_ids = {}
+        self.__flushed_arguments_count = 0
+        self.__buffer = create_empty_columns()
+
+        if self.filename:
+            with open(self.filename, "wb") as log_file:
+                log_file.write(MAGIC)
+
+    def __len__(self) -> int:
+        return self.records_count
+
+    def __get_argument_id(self, argument: ArgumentsPair) -> int:
+        argument_string = argument.to_str()
+
+        argument_id = self.__arguments_ids.get(argument_string)
+        if argument_id is None:
+            argument_id = len(self.arguments)
+            self.__arguments_ids[argument_string] = argument_id
+            self.arguments.append(argument_string)
+
+        return argument_id
+
+    @staticmethod
+    def __get_flags(
+        argument: ArgumentsPair, result: QBDIAnalysisResult, is_baseline: bool
+    ) -> int:
+        flags = ExecutionFlag(0)
+        if result.uses_file:
+            flags |= ExecutionFlag.USES_FILE
+        if result.uses_stdin:
+            flags |= ExecutionFlag.USES_STDIN
+        if result.is_timeout():
+            flags |= ExecutionFlag.TIMEOUT
+        if is_baseline:
+            flags |= ExecutionFlag.BASELINE
+        if argument.valid_roles:
+            flags |= ExecutionFlag.HAS_ROLES
+        if result.bbs_hash is None:
+            flags |= ExecutionFlag.MISSING_RESULT
+
+        return int(flags)
+
+    def record(
+        self,
+        argument: ArgumentsPair,
+        result: QBDIAnalysisResult,
+        is_baseline: bool = False,
+    ) -> None:
+        # Only plain numbers are kept, in typed arrays, instead of the
+        # arguments and results' objects.
+        self.__buffer["argument_id"].append(self.__get_argument_id(argument))
+        self.__buffer["bbs_count"].append(result.bbs_count or 0)
+        self.__buffer["bbs_hash"].append(result.bbs_hash or 0)
+        self.__buffer["exit_code"].append(result.exit_code or 0)
+        self.__buffer["flags"].append(
+            self.__get_flags(argument, result, is_baseline)
+        )
+        self.__buffer["duration"].append(result.duration)
+        self.records_count += 1
+
+        if self.filename and len(self.__buffer["flags"]) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        records_count = len(self.__buffer["flags"])
+        if not self.filename or not records_count:
+            return
+
+        new_arguments = json.dumps(
+            self.arguments[self.__flushed_arguments_count :]
+        ).encode("utf-8")
+
+        # The chunks are stored in little endian, as NumPy's default.
+        with open(self.filename, "ab") as log_file:
+            log_file.write(
+                CHUNK_HEADER.pack(records_count, len(new_arguments))
+            )
+            log_file.write(new_arguments)
+
+            for name in COLUMNS:
+                column = self.__buffer[name]
+                if sys.byteorder == "big":
+                    column.byteswap()
+                log_file.write(column.tobytes())
+
+        self.__flushed_arguments_count = len(self.arguments)
+        self.__buffer = create_empty_columns()
+
+    def close(self) -> None:
+        self.flush()
+
+    def read_columns(self) -> Columns:
+        if self.filename:
+            columns, _ = self.read(self.filename)
+        else:
+            columns = create_empty_columns()
+
+        for name, column in self.__buffer.items():
+            columns[name].extend(column)
+
+        return columns
+
+    @staticmethod
+    def read(filename: str) -> typing.Tuple[Columns, typing.List[str]]:
+        columns = create_empty_columns()
+        arguments = []
+
+        with open(filename, "rb") as log_file:
+            if log_file.read(len(MAGIC)) != MAGIC:
+                raise InvalidExecutionLogException()
+
+            # A truncated or corrupted chunk makes the whole log invalid.
+            try:
+                while header := log_file.read(CHUNK_HEADER.size):
+                    records_count, arguments_size = CHUNK_HEADER.unpack(header)
+                    arguments.extend(json.loads(log_file.read(arguments_size)))
+
+                    for name, column in columns.items():
+                        chunk = array.array(column.typecode)
+                        chunk.fromfile(log_file, records_count)
+                        if sys.byteorder == "big":
+                            chunk.byteswap()
+                        column.extend(chunk)
+            except (struct.error, ValueError, EOFError) as exception:
+                raise InvalidExecutionLogException() from exception
+
+        return columns, arguments
+
+    def export_npz(self, filename: str) -> None:
+        export_npz(self.read_columns(), self.arguments, filename)
+
+    def export_parquet(self, filename: str) -> None:
+        export_parquet(self.read_columns(), self.arguments, filename)
+
+
+def convert_to_numpy(columns: Columns) -> typing.Dict[str, typing.Any]:
+    import numpy  # pylint: disable=import-outside-toplevel
+
+    # The arrays' buffers are shared, not copied.
+    return {
+        name: numpy.frombuffer(column, dtype=column.typecode)
+        for name, column in columns.items()
+    }
+
+
+def export_npz(
+    columns: Columns, arguments: typing.List[str], filename: str
+) -> None:
+    import numpy  # pylint: disable=import-outside-toplevel
+
+    numpy.savez_compressed(
+        filename,
+        arguments=numpy.array(arguments, dtype=str),
+        **convert_to_numpy(columns),
+    )
+
+
+def export_parquet(
+    columns: Columns, arguments: typing.List[str], filename: str
+) -> None:
+    import pyarrow  # pylint: disable=import-outside-toplevel
+    import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+
+    # The argument identifiers become a dictionary-encoded column, which
+    # keeps the file as compact as the log itself.
+    numpy_columns = convert_to_numpy(columns)
+    table_columns = {
+        "argument": pyarrow.DictionaryArray.from_arrays(
+            pyarrow.array(numpy_columns.pop("argument_id")),
+            pyarrow.array(arguments, type=pyarrow.string()),
+        )
+    }
+    for name, column in numpy_columns.items():
+        table_columns[name] = pyarrow.array(column)
+
+    pyarrow.parquet.write_table(pyarrow.table(table_columns), filename)
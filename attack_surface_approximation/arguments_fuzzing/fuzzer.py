@@ -1,62 +1,291 @@
 import typing
 
+from attack_surface_approximation.arguments_fuzzing.adaptive_timeout import (
+    AdaptiveTimeout,
+)
 from attack_surface_approximation.arguments_fuzzing.arguments_types import (
     ArgumentsPair,
+    FileArgument,
+)
+from attack_surface_approximation.arguments_fuzzing.corpus import (
+    FuzzingCorpus,
+)
+from attack_surface_approximation.arguments_fuzzing.fuzzing_plan import (
+    FuzzingPlan,
+    StaticProfile,
 )
 from attack_surface_approximation.arguments_fuzzing.fuzzing_sequence_generator import (
     FuzzingSequenceGenerator,
 )
+from attack_surface_approximation.arguments_fuzzing.scheduler import (
+    FuzzingBudget,
+    FuzzingReport,
+    FuzzingScheduler,
+    count_entries,
+)
 from attack_surface_approximation.configuration import Configuration
+from attack_surface_approximation.tracing import trace_span
 
-from .qbdi_analysis import QBDIAnalysis
+from .qbdi_analysis import QBDIAnalysis, QBDIAnalysisResult
 
 ANALYSIS_TIMEOUT = 3
 CANARY_STRING = "string"
 RANDOM_ARGUMENTS_COUNT = 10
 
+# Called with each executed argument, its result and if it is a baseline one
+AnalysisCallback = typing.Callable[
+    [ArgumentsPair, QBDIAnalysisResult, bool], None
+]
+
 
 class ArgumentsFuzzer:
     __configuration: object = Configuration.Fuzzer
     executable_filename: str
-    dictionary: typing.List[str]
+    dictionary: typing.Iterable[str]
     analysis: QBDIAnalysis
     arguments_generator: FuzzingSequenceGenerator
     baseline_hashes: typing.List[str]
     old_hashes: typing.List[str]
+    corpus: typing.Optional[FuzzingCorpus]
+    previous_valid_arguments: typing.List[ArgumentsPair]
+    budget: FuzzingBudget
+    valid_arguments: typing.List[ArgumentsPair]
+    tried_candidates: int
+    skipped_candidates: int
+    covered_entries: typing.Set[str]
+    is_budget_exhausted: bool
+    adaptive_timeout: typing.Optional[AdaptiveTimeout]
+    on_analysis: typing.Optional[AnalysisCallback]
+    plan: FuzzingPlan
+    harvest_dictionary: bool
+    harvested_dictionary: typing.List[str]
+    environment_variables: typing.List[str]
+    option_arities: typing.Optional[typing.Dict[str, int]]
 
     def __init__(
-        self, executable_filename: str, dictionary: typing.List[str]
+        self,
+        executable_filename: str,
+        dictionary: typing.Iterable[str],
+        corpus: typing.Optional[FuzzingCorpus] = None,
+        budget: typing.Optional[FuzzingBudget] = None,
+        timeout_safety_margin: typing.Optional[float] = None,
+        analysis: typing.Optional[QBDIAnalysis] = None,
+        on_analysis: typing.Optional[AnalysisCallback] = None,
+        static_profile: typing.Optional[StaticProfile] = None,
+        compute_static_profile: bool = False,
+        harvest_dictionary: bool = False,
+        option_arities: typing.Optional[typing.Dict[str, int]] = None,
     ) -> None:
         self.executable_filename = executable_filename
-        self.dictionary = dictionary
+        self.option_arities = option_arities
+        self.on_analysis = on_analysis
+        self.harvest_dictionary = harvest_dictionary
+        self.harvested_dictionary = []
+        self.environment_variables = []
+        self.corpus = corpus
+        self.budget = budget if budget else FuzzingBudget()
+
+        self.valid_arguments = []
+        self.tried_candidates = 0
+        self.skipped_candidates = 0
+        self.covered_entries = set()
+        self.is_budget_exhausted = False
+
+        if static_profile is None and compute_static_profile:
+            with trace_span("ArgumentsFuzzer.static_profile"):
+                static_profile = StaticProfile.compute(executable_filename)
+        self.plan = FuzzingPlan(static_profile)
 
-        self.analysis = QBDIAnalysis(
-            executable_filename,
-            ANALYSIS_TIMEOUT,
+        if self.__configuration.ADAPTIVE_TIMEOUT:
+            if timeout_safety_margin is None:
+                timeout_safety_margin = (
+                    self.__configuration.TIMEOUT_SAFETY_MARGIN
+                )
+
+            self.adaptive_timeout = AdaptiveTimeout(
+                ANALYSIS_TIMEOUT,
+                self.__configuration.MIN_ANALYSIS_TIMEOUT,
+                timeout_safety_margin,
+            )
+        else:
+            self.adaptive_timeout = None
+
+        # A bounded run spends its budget on the most promising entries first.
+        is_bounded = (
+            self.budget.time_budget is not None
+            or self.budget.exec_budget is not None  # noqa: W503
         )
-        temp_filename = self.analysis.create_temp_file_inside_container()
+        if is_bounded:
+            with trace_span("ArgumentsFuzzer.prioritize"):
+                scheduler = FuzzingScheduler(executable_filename, self.corpus)
+                self.dictionary = scheduler.prioritize(dictionary)
+        else:
+            self.dictionary = dictionary
+
+        if self.corpus:
+            self.previous_valid_arguments = self.corpus.get_valid_arguments()
+        else:
+            self.previous_valid_arguments = []
 
+        if self.plan.is_fuzzing_needed():
+            self.__prepare_analysis(analysis, is_bounded)
+        else:
+            # Nothing is executed, hence no container is created.
+            self.analysis = analysis
+            self.arguments_generator = self.__create_arguments_generator(
+                None, is_bounded
+            )
+            self.baseline_hashes = []
+            self.old_hashes = []
+
+    def __create_arguments_generator(
+        self, temp_filename: typing.Optional[str], is_bounded: bool
+    ) -> FuzzingSequenceGenerator:
         random_arguments_config = (
             self.__configuration.GENERATE_RANDOM_BASELINE_ARGUMENTS
         )
-        self.arguments_generator = FuzzingSequenceGenerator(
+
+        return FuzzingSequenceGenerator(
             self.dictionary,
             temp_filename,
             CANARY_STRING,
             generate_random_baseline_arguments=random_arguments_config,
+            defer_file_arguments=is_bounded,
+            include_file_arguments=self.plan.are_file_arguments_needed(),
+            generate_probe_arguments=self.harvest_dictionary,
+            option_arities=self.option_arities,
         )
-        self.baseline_hashes = list(self.__generate_baseline_hashes())
+
+    def __prepare_analysis(
+        self, analysis: typing.Optional[QBDIAnalysis], is_bounded: bool
+    ) -> None:
+        # An already created analysis backend can be provided, for example one
+        # using another Docker host.
+        if analysis:
+            self.analysis = analysis
+            self.analysis.timeout = ANALYSIS_TIMEOUT
+        else:
+            self.analysis = QBDIAnalysis(
+                self.executable_filename,
+                ANALYSIS_TIMEOUT,
+            )
+        temp_filename = self.analysis.create_temp_file_inside_container()
+
+        self.arguments_generator = self.__create_arguments_generator(
+            temp_filename, is_bounded
+        )
+        with trace_span("ArgumentsFuzzer.baseline"):
+            baseline_results = list(self.__analyze_baseline_arguments())
+        self.baseline_hashes = [result.bbs_hash for result in baseline_results]
         self.old_hashes = []
 
-    def __generate_baseline_hashes(self) -> typing.Generator[str, None, None]:
+        # The environment variables read by the program are kept for a
+        # subsequent fuzzing of the environment.
+        self.environment_variables = list(
+            dict.fromkeys(
+                name
+                for result in baseline_results
+                for name in result.environment_variables
+            )
+        )
+
+        if self.harvest_dictionary:
+            self.__use_harvested_dictionary(baseline_results)
+
+        # The per-target timeout is derived from the durations of the baseline
+        # runs, which were executed with the fixed, maximum timeout.
+        if self.adaptive_timeout:
+            self.analysis.timeout = self.adaptive_timeout.calibrate(
+                baseline_results
+            )
+
+        if self.corpus:
+            self.corpus.add_baseline_hashes(self.baseline_hashes)
+            self.baseline_hashes = self.corpus.get_baseline_hashes()
+            self.old_hashes = self.corpus.get_seen_hashes()
+
+    def __use_harvested_dictionary(
+        self, baseline_results: typing.List[QBDIAnalysisResult]
+    ) -> None:
+        self.harvested_dictionary = list(
+            dict.fromkeys(
+                harvested_string
+                for result in baseline_results
+                for harvested_string in result.harvested_strings
+            )
+        )
+
+        # Nothing is harvested from a program comparing its arguments without
+        # the libc, for example a statically linked one, so the given
+        # dictionary is kept.
+        if self.harvested_dictionary:
+            self.dictionary = self.harvested_dictionary
+            self.arguments_generator.arguments = self.harvested_dictionary
+
+    def __run_analysis(self, argument: ArgumentsPair) -> QBDIAnalysisResult:
+        # An analysis can run the program more than once, for example to
+        # retry a timeout with a fed standard input, and each run is counted.
+        executions = self.analysis.executions
+        result = self.analysis.analyze(argument)
+        self.budget.consume_executions(self.analysis.executions - executions)
+
+        return result
+
+    def __analyze(self, argument: ArgumentsPair) -> QBDIAnalysisResult:
+        with trace_span(
+            "QBDIAnalysis.analyze", profile=False, argument=argument.to_str()
+        ):
+            result = self.__run_analysis(argument)
+
+        if not self.adaptive_timeout:
+            return result
+
+        if self.__is_suspicious_timeout(result):
+            result = self.__confirm_timeout(argument)
+
+        self.analysis.timeout = self.adaptive_timeout.observe(result)
+
+        return result
+
+    def __is_suspicious_timeout(self, result: QBDIAnalysisResult) -> bool:
+        # A run that times out even when the standard input is fed may be a slow
+        # one that exceeded the calibrated timeout, not a blocked one.
+        return (
+            result.is_timeout()
+            and not result.uses_stdin  # noqa: W503
+            and self.adaptive_timeout.can_be_extended()  # noqa: W503
+        )
+
+    def __confirm_timeout(self, argument: ArgumentsPair) -> QBDIAnalysisResult:
+        # Every timeout is confirmed, with a retry timeout bounded to a
+        # multiple of the calibrated one, such that the genuine hangs stay
+        # cheap.
+        calibrated_timeout = self.analysis.timeout
+        confirmation_factor = self.__configuration.CONFIRMATION_TIMEOUT_FACTOR
+        self.analysis.timeout = min(
+            self.adaptive_timeout.ceiling,
+            calibrated_timeout * confirmation_factor,
+        )
+
+        result = self.__run_analysis(argument)
+
+        self.analysis.timeout = calibrated_timeout
+
+        return result
+
+    def __analyze_baseline_arguments(
+        self,
+    ) -> typing.Generator[QBDIAnalysisResult, None, None]:
         arguments = self.arguments_generator.generate_baseline_arguments(
             RANDOM_ARGUMENTS_COUNT
         )
 
         for argument in arguments:
-            analysis_result = self.analysis.analyze(argument)
+            result = self.__analyze(argument)
+            if self.on_analysis:
+                self.on_analysis(argument, result, True)
 
-            yield analysis_result.bbs_hash
+            yield result
 
     def __check_if_argument_is_valid(
         self, argument: ArgumentsPair, result: QBDIAnalysis
@@ -69,31 +298,103 @@ class ArgumentsFuzzer:
 
         return False
 
+    def __is_already_tried(self, argument: ArgumentsPair) -> bool:
+        # The bare file argument is always executed, as its result decides if
+        # the arguments followed by a filename are generated.
+        return (
+            self.corpus is not None
+            and not isinstance(argument, FileArgument)  # noqa: W503
+            and self.corpus.is_tried(argument)  # noqa: W503
+        )
+
     def get_valid_argument(
         self,
     ) -> typing.Generator[ArgumentsPair, None, None]:
+        # The span measures the wall-clock time of the fuzzing, including the
+        # consumer's work between the yielded arguments. It is not profiled,
+        # as the profiler would stay enabled while the generator is suspended.
+        with trace_span("ArgumentsFuzzer.fuzz", profile=False):
+            yield from self.__generate_valid_arguments()
+
+    def __generate_valid_arguments(
+        self,
+    ) -> typing.Generator[ArgumentsPair, None, None]:
+        if not self.plan.is_fuzzing_needed():
+            return
+
+        # The budgets only cover the fuzzing, not the setup of the
+        # container and the baseline runs.
+        self.budget.start()
         arguments = self.arguments_generator.generate_fuzzing_arguments(
             self.baseline_hashes
         )
 
-        while True:
-            try:
-                argument = next(arguments)
-            except StopIteration:
-                break
+        try:
+            while True:
+                try:
+                    argument = next(arguments)
+                except StopIteration:
+                    break
+
+                if self.__is_already_tried(argument):
+                    self.skipped_candidates += 1
+                    continue
 
-            result = self.analysis.analyze(argument)
+                if self.budget.is_exhausted():
+                    self.is_budget_exhausted = True
+                    break
 
-            if self.__check_if_argument_is_valid(argument, result):
-                yield argument
+                result = self.__analyze(argument)
+                self.tried_candidates += 1
+                if self.arguments_generator.is_dictionary_candidate(argument):
+                    self.covered_entries.add(argument.first)
 
-            # Ensures the deduplication of --flag and --flag <string>. If the latter
-            # generates a different hash than the baseline ones, it will be detected
-            # as a false flag because of the sequence generation: --flag first, --flag
-            # <string> afterwards.
-            self.old_hashes.append(result.bbs_hash)
+                is_valid = self.__check_if_argument_is_valid(argument, result)
+                if self.on_analysis:
+                    self.on_analysis(argument, result, False)
 
-            self.arguments_generator.update_last_analysis_result(result)
+                if is_valid:
+                    self.valid_arguments.append(argument)
+                    if self.corpus:
+                        self.corpus.add_valid_argument(argument)
+
+                    yield argument
+
+                # Ensures the deduplication of --flag and --flag <string>. If the
+                # latter generates a different hash than the baseline ones, it will
+                # be detected as a false flag because of the sequence generation:
+                # --flag first, --flag <string> afterwards.
+                self.old_hashes.append(result.bbs_hash)
+                if self.corpus:
+                    self.corpus.add_seen_hash(result.bbs_hash)
+                    self.corpus.mark_tried(argument)
+
+                self.arguments_generator.update_last_analysis_result(result)
+        finally:
+            if self.corpus:
+                self.corpus.commit()
 
     def get_all_valid_arguments(self) -> typing.List[ArgumentsPair]:
-        return list(self.get_valid_argument())
+        return self.previous_valid_arguments + list(self.get_valid_argument())
+
+    def __count_avoided_executions(self) -> int:
+        if not self.plan.is_fuzzing_needed():
+            return self.arguments_generator.count_all_candidates(
+                RANDOM_ARGUMENTS_COUNT
+            )
+
+        return self.arguments_generator.avoided_candidates_count
+
+    def get_report(self) -> FuzzingReport:
+        return FuzzingReport(
+            self.previous_valid_arguments + self.valid_arguments,
+            self.budget.executions,
+            self.budget.get_elapsed_time(),
+            self.tried_candidates,
+            self.skipped_candidates,
+            len(self.covered_entries),
+            count_entries(self.dictionary),
+            len(set(self.old_hashes)),
+            self.is_budget_exhausted,
+            self.__count_avoided_executions(),
+        )
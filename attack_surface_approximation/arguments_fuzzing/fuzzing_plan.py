@@ -0,0 +1,55 @@
+import typing
+
+if typing.TYPE_CHECKING:
+    from attack_surface_approximation.static_input_streams_detection import (
+        InputStreamsDetector,
+    )
+
+
+class StaticProfile:
+    uses_arguments: bool
+    uses_files: bool
+
+    def __init__(
+        self, uses_arguments: bool = True, uses_files: bool = True
+    ) -> None:
+        self.uses_arguments = uses_arguments
+        self.uses_files = uses_files
+
+    @staticmethod
+    def from_detector(detector: "InputStreamsDetector") -> "StaticProfile":
+        return StaticProfile(detector.uses_arguments(), detector.uses_files())
+
+    @staticmethod
+    def compute(executable_filename: str) -> "StaticProfile":
+        # pylint: disable=import-outside-toplevel
+        from attack_surface_approximation.static_input_streams_detection import (
+            InputStreamsDetector,
+        )
+
+        return StaticProfile.from_detector(
+            InputStreamsDetector(executable_filename)
+        )
+
+
+class FuzzingPlan:
+    profile: StaticProfile
+
+    def __init__(self, profile: typing.Optional[StaticProfile] = None) -> None:
+        # Without a static profile, no candidate family is ruled out.
+        self.profile = profile if profile else StaticProfile()
+
+    def is_fuzzing_needed(self) -> bool:
+        return self.profile.uses_arguments
+
+    def are_file_arguments_needed(self) -> bool:
+        return self.profile.uses_files
+
+    def get_skipped_families(self) -> typing.List[str]:
+        if not self.is_fuzzing_needed():
+            return ["all (main() ignores its arguments)"]
+
+        if not self.are_file_arguments_needed():
+            return ["file arguments (no file API is imported)"]
+
+        return []
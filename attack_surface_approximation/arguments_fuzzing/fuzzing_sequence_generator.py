@@ -8,29 +8,53 @@ from attack_surface_approximation.arguments_fuzzing.arguments_types import (
     ArgumentRole,
     ArgumentsPair,
     ArgumentStringArgument,
+    AttachedFileArgument,
+    AttachedStringArgument,
     FileArgument,
     NoneArgument,
 )
 from attack_surface_approximation.arguments_fuzzing.qbdi_analysis import (
     QBDIAnalysisResult,
 )
+from attack_surface_approximation.arguments_fuzzing.scheduler import (
+    count_entries,
+)
+from attack_surface_approximation.getopt_options import (
+    NO_ARGUMENT,
+    OPTIONAL_ARGUMENT,
+    REQUIRED_ARGUMENT,
+)
 
 ArgumentsGenerator = typing.Generator[ArgumentsPair, None, None]
 
+# Invalid arguments, making the program compare them with all its options
+PROBE_ARGUMENTS = ["--opencrs-probe", "-~", "opencrs-probe"]
+# Conventional argument making a program read its standard input
+STDIN_ARGUMENT = "-"
+
 
 class FuzzingSequenceGenerator:
-    arguments: typing.List[str]
+    arguments: typing.Iterable[str]
     canary_filename: str
     canary_string: str
     last_analysis_result: str
     generate_random_baseline_arguments: bool
+    generate_probe_arguments: bool
+    defer_file_arguments: bool
+    include_file_arguments: bool
+    option_arities: typing.Dict[str, int]
+    avoided_candidates_count: int
 
     def __init__(
         self,
-        arguments: typing.List[str],
+        arguments: typing.Iterable[str],
         canary_filename: str,
         canary_string: str,
         generate_random_baseline_arguments: bool = False,
+        defer_file_arguments: bool = False,
+        include_file_arguments: bool = True,
+        generate_probe_arguments: bool = False,
+        option_arities: typing.Optional[typing.Dict[str, int]] = None,
     ) -> None:
         self.canary_filename = canary_filename
         self.arguments = arguments
@@ -38,6 +62,11 @@ class FuzzingSequenceGenerator:
         self.generate_random_baseline_arguments = (
             generate_random_baseline_arguments
         )
+        self.generate_probe_arguments = generate_probe_arguments
+        self.defer_file_arguments = defer_file_arguments
+        self.include_file_arguments = include_file_arguments
+        self.option_arities = option_arities if option_arities else {}
+        self.avoided_candidates_count = 0
 
     def update_last_analysis_result(
         self, last_analysis_result: QBDIAnalysisResult
@@ -62,6 +91,10 @@ class FuzzingSequenceGenerator:
 
                 yield ArgumentArgument(arg_preffix + text)
 
+    def __generate_probe_arguments(self) -> ArgumentsGenerator:
+        for arg in PROBE_ARGUMENTS:
+            yield ArgumentArgument(arg)
+
     def generate_baseline_arguments(
         self, invalid_arguments_length: int
     ) -> ArgumentsGenerator:
@@ -73,19 +106,83 @@ class FuzzingSequenceGenerator:
                 invalid_arguments_length
             )
 
+        if self.generate_probe_arguments:
+            yield from self.__generate_probe_arguments()
+
     def generate_fuzzing_arguments(
         self, bbs_hashes_baseline: typing.List[str]
     ) -> ArgumentsGenerator:
-        arg = FileArgument(self.canary_filename)
-        yield arg
-        if ArgumentRole.FILE_ENABLER not in arg.get_roles_based_on_analysis(
-            self.last_analysis_result, bbs_hashes_baseline
-        ):
-            for argument in self.arguments:
-                yield ArgumentPlusFileArgument(argument, self.canary_filename)
+        if self.include_file_arguments:
+            arg = FileArgument(self.canary_filename)
+            yield arg
+            is_file_enabler = (
+                ArgumentRole.FILE_ENABLER
+                in arg.get_roles_based_on_analysis(
+                    self.last_analysis_result, bbs_hashes_baseline
+                )
+            )
+        else:
+            # A program not using files can not be a file enabler, so the bare
+            # file argument and the whole sweep are avoided.
+            is_file_enabler = False
+            self.avoided_candidates_count += 1
 
-        yield ArgumentArgument("-")
+        sweeps_files = self.include_file_arguments and not is_file_enabler
+        if sweeps_files and not self.defer_file_arguments:
+            yield from self.__generate_file_arguments()
+
+        yield ArgumentArgument(STDIN_ARGUMENT)
 
         for argument in self.arguments:
-            yield ArgumentArgument(argument)
-            yield ArgumentStringArgument(argument, self.canary_string)
+            # The known arity of an option rules out the candidates with a
+            # missing or an unexpected value.
+            arity = self.option_arities.get(argument)
+            if arity != REQUIRED_ARGUMENT:
+                yield ArgumentArgument(argument)
+            else:
+                self.avoided_candidates_count += 1
+
+            if arity == OPTIONAL_ARGUMENT:
+                yield AttachedStringArgument(argument, self.canary_string)
+            elif arity != NO_ARGUMENT:
+                yield ArgumentStringArgument(argument, self.canary_string)
+            else:
+                self.avoided_candidates_count += 1
+
+            if not self.include_file_arguments:
+                self.avoided_candidates_count += 1
+
+        # When the fuzzing is bounded, the sweep of arguments followed by a
+        # filename is the least likely to pay off, so it is executed last.
+        if sweeps_files and self.defer_file_arguments:
+            yield from self.__generate_file_arguments()
+
+    @staticmethod
+    def is_dictionary_candidate(argument: ArgumentsPair) -> bool:
+        # The fuzzing candidates not built from a dictionary entry are the bare
+        # file argument and the standard input one.
+        return not isinstance(argument, FileArgument) and not (
+            isinstance(argument, ArgumentArgument)
+            and argument.first == STDIN_ARGUMENT  # noqa: W503
+        )
+
+    def count_all_candidates(self, invalid_arguments_length: int) -> int:
+        # The maximum number of executions, with a sweep of arguments followed
+        # by a filename.
+        baseline_count = sum(
+            1
+            for _ in self.generate_baseline_arguments(invalid_arguments_length)
+        )
+        entries_count = count_entries(self.arguments)
+
+        return baseline_count + 2 + 3 * entries_count
+
+    def __generate_file_arguments(self) -> ArgumentsGenerator:
+        for argument in self.arguments:
+            arity = self.option_arities.get(argument)
+            if arity == NO_ARGUMENT:
+                self.avoided_candidates_count += 1
+            elif arity == OPTIONAL_ARGUMENT:
+                yield AttachedFileArgument(argument, self.canary_filename)
+            else:
+                yield ArgumentPlusFileArgument(argument, self.canary_filename)
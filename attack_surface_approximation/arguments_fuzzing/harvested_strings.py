@@ -0,0 +1,93 @@
+import re
+import string
+import typing
+
+from attack_surface_approximation.getopt_options import (
+    HarvestedOption,
+    decode_optstring,
+)
+
+HARVESTED_STRINGS_EXTENSION = ".strings"
+MAX_CANDIDATE_LENGTH = 64
+FORBIDDEN_CHARACTERS = set(string.whitespace) | set("'\"`\\")
+
+# Types of the lines written by the tracer
+COMPARED_STRING_TYPE = "s"
+OPTSTRING_TYPE = "o"
+LONG_OPTION_TYPE = "l"
+ENVIRONMENT_VARIABLE_TYPE = "e"
+
+ENVIRONMENT_VARIABLE_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+HarvestedLine = typing.Tuple[str, str, typing.List[str]]
+
+
+def is_candidate(harvested_string: str) -> bool:
+    return (
+        0 < len(harvested_string) <= MAX_CANDIDATE_LENGTH
+        and harvested_string.isprintable()  # noqa: W503
+        and not FORBIDDEN_CHARACTERS & set(harvested_string)  # noqa: W503
+    )
+
+
+def read_harvested_lines(filename: str) -> typing.List[HarvestedLine]:
+    try:
+        with open(filename, "r", encoding="ascii") as strings_file:
+            lines = strings_file.readlines()
+    except (FileNotFoundError, UnicodeDecodeError):
+        return []
+
+    harvested_lines = []
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 2:
+            continue
+
+        try:
+            value = bytes.fromhex(fields[1]).decode("ascii")
+        except (ValueError, UnicodeDecodeError):
+            continue
+
+        harvested_lines.append((fields[0], value, fields[2:]))
+
+    return harvested_lines
+
+
+def decode_options(
+    line_type: str, value: str, other_fields: typing.List[str]
+) -> typing.List[HarvestedOption]:
+    if line_type == OPTSTRING_TYPE:
+        return decode_optstring(value)
+    elif (
+        line_type == LONG_OPTION_TYPE
+        and len(other_fields) == 1  # noqa: W503
+        and other_fields[0].isdigit()  # noqa: W503
+    ):
+        return [("--" + value, int(other_fields[0]))]
+    elif line_type == COMPARED_STRING_TYPE:
+        # The arity of a compared string is unknown.
+        return [(value, None)]
+    else:
+        return []
+
+
+def parse_harvested_strings(filename: str) -> typing.List[str]:
+    candidates = (
+        option
+        for line in read_harvested_lines(filename)
+        for option, _ in decode_options(*line)
+    )
+
+    return list(dict.fromkeys(filter(is_candidate, candidates)))
+
+
+def parse_environment_variables(filename: str) -> typing.List[str]:
+    names = (
+        value
+        for line_type, value, _ in read_harvested_lines(filename)
+        if line_type == ENVIRONMENT_VARIABLE_TYPE
+    )
+
+    return list(
+        dict.fromkeys(filter(ENVIRONMENT_VARIABLE_PATTERN.fullmatch, names))
+    )
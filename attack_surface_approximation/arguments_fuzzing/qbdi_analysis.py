@@ -1,6 +1,8 @@
 import os
+import shlex
 import shutil
 import stat
+import time
 import typing
 
 import docker
@@ -9,7 +11,20 @@ from docker.models.containers import ExecResult
 from attack_surface_approximation.arguments_fuzzing.arguments_types import (
     ArgumentsPair,
 )
+from attack_surface_approximation.arguments_fuzzing.harvested_strings import (
+    HARVESTED_STRINGS_EXTENSION,
+    parse_environment_variables,
+    parse_harvested_strings,
+)
 from attack_surface_approximation.configuration import Configuration
+from attack_surface_approximation.tracing import trace_span, traced
+
+if typing.TYPE_CHECKING:
+    from attack_surface_approximation.arguments_fuzzing.cassette import (
+        Cassette,
+    )
+
+TIMEOUT_EXIT_CODE = 124
 
 
 class RawQBDIAnalysisResult:
@@ -17,14 +32,32 @@ class RawQBDIAnalysisResult:
     bbs_hash: int
     uses_file: bool
     exit_code: int
+    duration: float
+    harvested_strings: typing.List[str]
+    environment_variables: typing.List[str]
 
     def __init__(
-        self, bbs_count: int, bbs_hash: int, uses_file: bool, exit_code: int
+        self,
+        bbs_count: int,
+        bbs_hash: int,
+        uses_file: bool,
+        exit_code: int,
+        duration: float = 0,
+        harvested_strings: typing.Optional[typing.List[str]] = None,
+        environment_variables: typing.Optional[typing.List[str]] = None,
     ) -> None:
         self.bbs_count = bbs_count
         self.bbs_hash = bbs_hash
         self.uses_file = uses_file
         self.exit_code = exit_code
+        self.duration = duration
+        self.harvested_strings = harvested_strings if harvested_strings else []
+        self.environment_variables = (
+            environment_variables if environment_variables else []
+        )
+
+    def is_timeout(self) -> bool:
+        return self.exit_code == TIMEOUT_EXIT_CODE
 
 
 class QBDIAnalysisResult(RawQBDIAnalysisResult):
@@ -37,8 +70,19 @@ class QBDIAnalysisResult(RawQBDIAnalysisResult):
         uses_file: bool,
         exit_code: int,
         uses_stdin: bool,
+        duration: float = 0,
+        harvested_strings: typing.Optional[typing.List[str]] = None,
+        environment_variables: typing.Optional[typing.List[str]] = None,
     ) -> None:
-        super().__init__(bbs_count, bbs_hash, uses_file, exit_code)
+        super().__init__(
+            bbs_count,
+            bbs_hash,
+            uses_file,
+            exit_code,
+            duration,
+            harvested_strings,
+            environment_variables,
+        )
 
         self.uses_stdin = uses_stdin
 
@@ -48,15 +92,53 @@ class QBDIAnalysis:
     __docker_client: docker.client
     __container: docker.api.container
     executable_filename: str
-    timeout: int
+    timeout: float
+    executions: int
+    host_folder: str
+    host_executable_folder: str
+    host_executable: str
+    host_results_folder: str
+    cassette: typing.Optional["Cassette"]
 
-    def __init__(self, executable_filename: str, timeout: int) -> None:
+    def __init__(
+        self,
+        executable_filename: str,
+        timeout: float,
+        host_folder: typing.Optional[str] = None,
+        docker_host: typing.Optional[str] = None,
+        cassette: typing.Optional["Cassette"] = None,
+    ) -> None:
         self.executable_filename = executable_filename
         self.timeout = timeout
-
-        self.__docker_client = docker.from_env()
+        self.executions = 0
+        self.cassette = cassette
+        self.__set_host_paths(host_folder)
+
+        # Multiple analyses can run on the same machine if they use different
+        # host folders, and on other machines' daemons via their Docker host.
+        if docker_host:
+            self.__docker_client = docker.DockerClient(base_url=docker_host)
+        else:
+            self.__docker_client = docker.from_env()
         self.__create_container()
 
+    def __relocate_host_path(self, path: str) -> str:
+        relative_path = os.path.relpath(path, self.__configuration.HOST_FOLDER)
+
+        return os.path.join(self.host_folder, relative_path)
+
+    def __set_host_paths(self, host_folder: typing.Optional[str]) -> None:
+        self.host_folder = host_folder or self.__configuration.HOST_FOLDER
+        self.host_executable_folder = self.__relocate_host_path(
+            self.__configuration.HOST_EXECUTABLE_FOLDER
+        )
+        self.host_executable = self.__relocate_host_path(
+            self.__configuration.HOST_EXECUTABLE
+        )
+        self.host_results_folder = self.__relocate_host_path(
+            self.__configuration.HOST_RESULTS_FOLDER
+        )
+
     # def __del__(self) -> None:
     #     self.__container.remove(force=True)
 
@@ -68,17 +150,24 @@ class QBDIAnalysis:
             os.makedirs(folder_name)
 
     def __create_temporary_folder_structure(self) -> None:
-        self.__touch_nested_folder(self.__configuration.HOST_FOLDER)
-        self.__touch_nested_folder(self.__configuration.HOST_EXECUTABLE_FOLDER)
-        self.__touch_nested_folder(self.__configuration.HOST_RESULTS_FOLDER)
-        shutil.copyfile(
-            self.executable_filename, self.__configuration.HOST_EXECUTABLE
-        )
-        os.chmod(self.__configuration.HOST_EXECUTABLE, stat.S_IXUSR)
+        self.__touch_nested_folder(self.host_folder)
+        self.__touch_nested_folder(self.host_executable_folder)
+        self.__touch_nested_folder(self.host_results_folder)
+        shutil.copyfile(self.executable_filename, self.host_executable)
+        os.chmod(self.host_executable, stat.S_IXUSR)
 
+    @traced("QBDIAnalysis.create_container")
     def __create_container(self) -> None:
-        self.__create_temporary_folder_structure()
+        with trace_span("QBDIAnalysis.create_temporary_folder_structure"):
+            self.__create_temporary_folder_structure()
+
+        with trace_span("QBDIAnalysis.start_container"):
+            self.__start_container()
+
+        with trace_span("QBDIAnalysis.build_tracer"):
+            self.__build_tracer()
 
+    def __start_container(self) -> None:
         template = os.path.join(
             os.path.dirname(os.path.abspath(__file__)),
             "qbdi_analysis_scripts/qbdi_preload_template.c",
@@ -93,11 +182,11 @@ class QBDIAnalysis:
             detach=True,
             tty=True,
             volumes={
-                self.__configuration.HOST_EXECUTABLE_FOLDER: {
+                self.host_executable_folder: {
                     "bind": self.__configuration.CONTAINER_EXECUTABLE_FOLDER,
                     "mode": "rw",
                 },
-                self.__configuration.HOST_RESULTS_FOLDER: {
+                self.host_results_folder: {
                     "bind": self.__configuration.CONTAINER_RESULTS_FOLDER,
                     "mode": "rw",
                 },
@@ -117,6 +206,7 @@ class QBDIAnalysis:
             },
         )
 
+    def __build_tracer(self) -> None:
         self.__container.exec_run(
             f"sudo chmod 555 {self.__configuration.CONTAINER_EXECUTABLE}"
         )
@@ -138,9 +228,14 @@ class QBDIAnalysis:
         return self.__configuration.CONTAINER_TEMP_FILE
 
     def __build_and_run_analyze_command(
-        self, argument: ArgumentsPair, timeout_retry: bool
+        self,
+        argument: ArgumentsPair,
+        timeout_retry: bool,
+        environment: typing.Dict[str, str],
     ) -> ExecResult:
-        command = self.__build_analyze_command(argument, timeout_retry)
+        command = self.__build_analyze_command(
+            argument, timeout_retry, environment
+        )
 
         return self.__container.exec_run(
             command,
@@ -148,25 +243,41 @@ class QBDIAnalysis:
         )
 
     def __build_analyze_command(
-        self, argument: ArgumentsPair, timeout_retry: bool
-    ) -> str:
+        self,
+        argument: ArgumentsPair,
+        timeout_retry: bool,
+        environment: typing.Dict[str, str],
+    ) -> typing.List[str]:
         stringified_arguments = argument.to_str()
         stdin_avoidance_command = "echo '\n' |" if timeout_retry else ""
 
-        return (  # TODO: {self.__configuration.CONTAINER_EXECUTABLE}
-            f"timeout {self.timeout} sh -c "
-            f"'{stdin_avoidance_command} LD_BIND_NOW=1 "
-            "LD_PRELOAD=./libqbdi_tracer.so "
-            "uname "
-            f"{stringified_arguments}'"
+        # The variables are only set for the analyzed program, not for the
+        # shell, and their values are quoted.
+        environment_assignments = "".join(
+            f"{name}={shlex.quote(value)} "
+            for name, value in environment.items()
         )
 
+        # The script is passed as a separate argument of the shell, such that
+        # it is not quoted again.
+        return [
+            "timeout",
+            str(self.timeout),
+            "sh",
+            "-c",
+            (  # TODO: {self.__configuration.CONTAINER_EXECUTABLE}
+                f"{stdin_avoidance_command} {environment_assignments}"
+                "LD_BIND_NOW=1 "
+                "LD_PRELOAD=./libqbdi_tracer.so "
+                "uname "
+                f"{stringified_arguments}"
+            ),
+        ]
+
     def __get_analysis_result_filename(self, argument: ArgumentsPair) -> str:
         argument_identifier = argument.to_hex_id()
 
-        return os.path.join(
-            self.__configuration.HOST_RESULTS_FOLDER, argument_identifier
-        )
+        return os.path.join(self.host_results_folder, argument_identifier)
 
     @staticmethod
     def __parse_raw_output(filename: str) -> typing.Tuple[int, int, int]:
@@ -182,11 +293,17 @@ class QBDIAnalysis:
             return (None, None, None)
 
     def __run_analysis(
-        self, argument: ArgumentsPair, timeout_retry: bool = False
+        self,
+        argument: ArgumentsPair,
+        timeout_retry: bool,
+        environment: typing.Dict[str, str],
     ) -> RawQBDIAnalysisResult:
+        self.executions += 1
+        start_time = time.monotonic()
         raw_result = self.__build_and_run_analyze_command(
-            argument, timeout_retry
+            argument, timeout_retry, environment
         )
+        duration = time.monotonic() - start_time
         print(raw_result.output)  # TODO: remove
 
         result_filename = self.__get_analysis_result_filename(argument)
@@ -194,8 +311,21 @@ class QBDIAnalysis:
             result_filename
         )
 
+        # The tracer also writes the strings to which the arguments were
+        # compared, for example by strcmp() or getopt_long(), and the names
+        # of the read environment variables.
+        strings_filename = result_filename + HARVESTED_STRINGS_EXTENSION
+        harvested_strings = parse_harvested_strings(strings_filename)
+        environment_variables = parse_environment_variables(strings_filename)
+
         return RawQBDIAnalysisResult(
-            bbs_count, bbs_hash, uses_file, raw_result.exit_code
+            bbs_count,
+            bbs_hash,
+            uses_file,
+            raw_result.exit_code,
+            duration,
+            harvested_strings,
+            environment_variables,
         )
 
     def __detect_stdin_usage(
@@ -203,29 +333,49 @@ class QBDIAnalysis:
         argument: ArgumentsPair,
         raw_analysis: RawQBDIAnalysisResult,
         timeout_retry: bool,
+        environment: typing.Dict[str, str],
     ) -> bool:
-        is_timeout = raw_analysis.exit_code == 124
+        is_timeout = raw_analysis.is_timeout()
         if timeout_retry and not is_timeout:
             return True
         elif not timeout_retry and is_timeout:
-            return self.analyze(argument, timeout_retry=True)
+            return self.analyze(
+                argument, timeout_retry=True, environment=environment
+            ).uses_stdin
         else:
             return False
 
     def analyze(
-        self, argument: ArgumentsPair, timeout_retry: bool = False
+        self,
+        argument: ArgumentsPair,
+        timeout_retry: bool = False,
+        environment: typing.Optional[typing.Dict[str, str]] = None,
     ) -> QBDIAnalysisResult:
-        raw_analysis = self.__run_analysis(argument, timeout_retry)
+        environment = environment if environment else {}
+
+        raw_analysis = self.__run_analysis(
+            argument, timeout_retry, environment
+        )
         uses_stdin = self.__detect_stdin_usage(
             argument,
             raw_analysis,
             timeout_retry,
+            environment,
         )
 
-        return QBDIAnalysisResult(
+        result = QBDIAnalysisResult(
             raw_analysis.bbs_count,
             raw_analysis.bbs_hash,
             raw_analysis.uses_file,
             raw_analysis.exit_code,
             uses_stdin,
+            raw_analysis.duration,
+            raw_analysis.harvested_strings,
+            raw_analysis.environment_variables,
         )
+
+        # The retries are part of the recorded analysis.
+        if self.cassette and not timeout_retry:
+            self.cassette.record(argument, result, self.timeout, environment)
+
+        return result
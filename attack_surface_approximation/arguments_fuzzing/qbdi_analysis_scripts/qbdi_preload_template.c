@@ -17,6 +17,13 @@
 #define BLOCKS_USED_IN_HASH 10000
 #define MAX_ARGS_LENGTH 100
 #define OUTPUT_FOLDER "results/"
+#define HARVESTED_STRINGS_EXTENSION ".strings"
+#define MAX_HARVESTED_LENGTH 64
+#define MAX_LONG_OPTIONS 1024
+
+#ifndef RTLD_DEFAULT
+#define RTLD_DEFAULT ((void *)0)
+#endif
 
 /* Structures */
 
@@ -25,6 +32,27 @@ typedef struct {
     unsigned int end;
 } segment;
 
+typedef struct {
+    const char *name;
+    int has_arg;
+    int *flag;
+    int val;
+} long_option;
+
+typedef enum {
+    COMPARED_STRINGS,
+    COMPARED_BUFFERS,
+    GETOPT_CALL,
+    GETOPT_LONG_CALL,
+    GETENV_CALL
+} hook_type;
+
+typedef struct {
+    const char *name;
+    hook_type type;
+    rword address;
+} hooked_function;
+
 typedef struct {
     const char *dli_fname;
     void *dli_fbase;
@@ -41,6 +69,24 @@ char command_line[MAX_ARGS_LENGTH] = {'\0'};
 char fds_location[20] = {'\0'};
 pid_t pid;
 char start_trace = 0, uses_canaries = 0;
+int program_argc = 0;
+char **program_argv = NULL;
+char strings_filename[2 * MAX_ARGS_LENGTH + sizeof(OUTPUT_FOLDER) + sizeof(HARVESTED_STRINGS_EXTENSION) + 1] = {'\0'};
+FILE *strings_file = NULL;
+char getopt_harvested = 0;
+hooked_function hooked_functions[] = {
+    {"strcmp", COMPARED_STRINGS, 0},
+    {"strcasecmp", COMPARED_STRINGS, 0},
+    {"strstr", COMPARED_STRINGS, 0},
+    {"strncmp", COMPARED_BUFFERS, 0},
+    {"strncasecmp", COMPARED_BUFFERS, 0},
+    {"memcmp", COMPARED_BUFFERS, 0},
+    {"getopt", GETOPT_CALL, 0},
+    {"getopt_long", GETOPT_LONG_CALL, 0},
+    {"getopt_long_only", GETOPT_LONG_CALL, 0},
+    {"getenv", GETENV_CALL, 0},
+    {"secure_getenv", GETENV_CALL, 0},
+};
 
 QBDIPRELOAD_INIT;
 
@@ -110,6 +156,153 @@ static VMAction show_basic_block_callback(VMInstanceRef vm, const VMState* vmSta
     return QBDI_CONTINUE;
 }
 
+rword get_call_argument(GPRState *gprState, int index) {
+    // On the call transfer, the return address is on the top of the stack and
+    // the (cdecl) arguments follow it.
+    return ((rword *)gprState->esp)[index + 1];
+}
+
+int find_argv_string(const char *pointer, size_t *offset) {
+    int i;
+    size_t length;
+
+    for (i = 1; i < program_argc; i++) {
+        length = strlen(program_argv[i]);
+        if (pointer >= program_argv[i] && pointer <= program_argv[i] + length) {
+            *offset = pointer - program_argv[i];
+            return i;
+        }
+    }
+
+    return -1;
+}
+
+void write_harvested_string(char type, const char *string, size_t length, int has_arg) {
+    char *encoded;
+
+    if (length == 0)
+        return;
+
+    if (strings_file == NULL) {
+        strings_file = fopen(strings_filename, "w");
+        if (strings_file == NULL)
+            return;
+    }
+
+    encoded = bin2hex((const unsigned char *)string, length);
+    if (encoded == NULL)
+        return;
+
+    if (has_arg < 0)
+        fprintf(strings_file, "%c %s\n", type, encoded);
+    else
+        fprintf(strings_file, "%c %s %d\n", type, encoded, has_arg);
+    fflush(strings_file);
+    free(encoded);
+}
+
+void harvest_compared_strings(const char *first, const char *second, size_t max_length) {
+    char candidate[2 * MAX_HARVESTED_LENGTH + 1];
+    const char *constant, *argv_pointer;
+    size_t first_offset, second_offset, offset, prefix_length = 0, length;
+    int first_index, second_index, i;
+
+    if (first == NULL || second == NULL)
+        return;
+
+    // Only the comparisons between an argument and another string are relevant
+    first_index = find_argv_string(first, &first_offset);
+    second_index = find_argv_string(second, &second_offset);
+    if (first_index != -1 && second_index == -1) {
+        argv_pointer = first;
+        constant = second;
+        i = first_index;
+        offset = first_offset;
+    } else if (first_index == -1 && second_index != -1) {
+        argv_pointer = second;
+        constant = first;
+        i = second_index;
+        offset = second_offset;
+    } else {
+        return;
+    }
+
+    // The dashes skipped by the program before comparing are kept, such that
+    // a comparison of argv[i] + 2 with "verbose" produces "--verbose".
+    if (offset <= MAX_HARVESTED_LENGTH && strspn(program_argv[i], "-") >= offset)
+        prefix_length = offset;
+    memcpy(candidate, argv_pointer - prefix_length, prefix_length);
+
+    length = strnlen(constant, max_length < MAX_HARVESTED_LENGTH ? max_length : MAX_HARVESTED_LENGTH);
+    memcpy(candidate + prefix_length, constant, length);
+
+    write_harvested_string('s', candidate, prefix_length + length, -1);
+}
+
+void harvest_getopt_options(const char *optstring, const long_option *long_options) {
+    int i;
+
+    // The options are the same on every call of the parsing loop.
+    if (getopt_harvested)
+        return;
+    getopt_harvested = 1;
+
+    if (optstring != NULL)
+        write_harvested_string('o', optstring, strlen(optstring), -1);
+
+    for (i = 0; long_options != NULL && i < MAX_LONG_OPTIONS && long_options[i].name != NULL; i++)
+        write_harvested_string('l', long_options[i].name, strnlen(long_options[i].name, MAX_HARVESTED_LENGTH), long_options[i].has_arg);
+}
+
+void harvest_environment_variable(const char *name) {
+    if (name != NULL)
+        write_harvested_string('e', name, strnlen(name, MAX_HARVESTED_LENGTH), -1);
+}
+
+void resolve_hooked_functions() {
+    size_t i;
+
+    // The addresses are the ones of the implementations selected by the
+    // IFUNC resolvers, whose local symbols are unknown to dladdr.
+    for (i = 0; i < sizeof(hooked_functions) / sizeof(hooked_functions[0]); i++)
+        hooked_functions[i].address = (rword)dlsym(RTLD_DEFAULT, hooked_functions[i].name);
+}
+
+void harvest_call(rword address, GPRState *gprState) {
+    hooked_function *function = NULL;
+    size_t i;
+
+    if (!start_trace || program_argv == NULL)
+        return;
+
+    for (i = 0; i < sizeof(hooked_functions) / sizeof(hooked_functions[0]); i++) {
+        if (hooked_functions[i].address != 0 && hooked_functions[i].address == address) {
+            function = &hooked_functions[i];
+            break;
+        }
+    }
+    if (function == NULL)
+        return;
+
+    switch (function->type) {
+    case COMPARED_STRINGS:
+        harvest_compared_strings((const char *)get_call_argument(gprState, 0), (const char *)get_call_argument(gprState, 1), MAX_HARVESTED_LENGTH);
+        break;
+    case COMPARED_BUFFERS:
+        harvest_compared_strings((const char *)get_call_argument(gprState, 0), (const char *)get_call_argument(gprState, 1), (size_t)get_call_argument(gprState, 2));
+        break;
+    case GETOPT_CALL:
+        harvest_getopt_options((const char *)get_call_argument(gprState, 2), NULL);
+        break;
+    case GETOPT_LONG_CALL:
+        harvest_getopt_options((const char *)get_call_argument(gprState, 2), (const long_option *)get_call_argument(gprState, 3));
+        break;
+    case GETENV_CALL:
+        harvest_environment_variable((const char *)get_call_argument(gprState, 0));
+        break;
+    }
+}
+
 static VMAction transfer_execution_callback(VMInstanceRef vm, const VMState *vmState, GPRState *gprState, FPRState *fprState, void *data) {
     Dl_info info = {0};
     DIR *directory;
@@ -118,6 +311,9 @@ static VMAction transfer_execution_callback(VMInstanceRef vm, const VMState *vmS
     char symlink_location[1024];
     unsigned int len;
 
+    // Check if the current call compares the arguments
+    harvest_call(gprState->eip, gprState);
+
     // Get the context
     dladdr((void *)gprState->eip, &info);
 
@@ -178,6 +374,14 @@ int qbdipreload_on_main(int argc, char **argv) {
     }
     command_line[strlen(command_line) - 1] = '\0';
 
+    // Keep the arguments, for the harvesting of the compared strings
+    program_argc = argc;
+    program_argv = argv;
+    strcat(strings_filename, OUTPUT_FOLDER);
+    strcat(strings_filename, encode_command_line(command_line, strlen(command_line)));
+    strcat(strings_filename, HARVESTED_STRINGS_EXTENSION);
+    resolve_hooked_functions();
+
     return QBDIPRELOAD_NOT_HANDLED;
 }
 
@@ -244,5 +448,8 @@ int qbdipreload_on_exit(int status) {
     output_file = fopen(output_filename, "w");
     fprintf(output_file, "%d %ld %d", utarray_len(blocks), hash(hashed), uses_canaries);
 
+    if (strings_file != NULL)
+        fclose(strings_file);
+
     return QBDIPRELOAD_NO_ERROR;
 }
\ No newline at end of file
@@ -0,0 +1,198 @@
+import itertools
+import time
+import typing
+
+from attack_surface_approximation.arguments_fuzzing.arguments_types import (
+    ArgumentsPair,
+)
+from attack_surface_approximation.arguments_fuzzing.binary_strings import (
+    extract_tokens,
+)
+from attack_surface_approximation.arguments_fuzzing.corpus import (
+    FuzzingCorpus,
+)
+
+PRIORITY_LEVELS_COUNT = 4
+MAX_BUFFERED_ENTRIES = 100000
+
+
+class FuzzingBudget:
+    time_budget: typing.Optional[float]
+    exec_budget: typing.Optional[int]
+    clock: typing.Callable[[], float]
+    start_time: typing.Optional[float]
+    executions: int
+
+    def __init__(
+        self,
+        time_budget: typing.Optional[float] = None,
+        exec_budget: typing.Optional[int] = None,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.time_budget = time_budget
+        self.exec_budget = exec_budget
+        self.clock = clock
+        self.start_time = None
+        self.executions = 0
+
+    def start(self) -> None:
+        self.start_time = self.clock()
+
+    def consume_executions(self, count: int) -> None:
+        # As for the time, the executions preceding the start (for example,
+        # the baseline runs) are not counted.
+        if self.start_time is not None:
+            self.executions += count
+
+    def get_elapsed_time(self) -> float:
+        if self.start_time is None:
+            return 0
+
+        return self.clock() - self.start_time
+
+    def is_exhausted(self) -> bool:
+        if (
+            self.exec_budget is not None
+            and self.executions >= self.exec_budget  # noqa: W503
+        ):
+            return True
+
+        if (
+            self.time_budget is not None
+            and self.get_elapsed_time() >= self.time_budget  # noqa: W503
+        ):
+            return True
+
+        return False
+
+
+class FuzzingReport:
+    valid_arguments: typing.List[ArgumentsPair]
+    executions: int
+    elapsed_time: float
+    tried_candidates: int
+    skipped_candidates: int
+    covered_entries: int
+    dictionary_entries: int
+    unique_hashes: int
+    is_budget_exhausted: bool
+    avoided_executions: int
+
+    def __init__(
+        self,
+        valid_arguments: typing.List[ArgumentsPair],
+        executions: int,
+        elapsed_time: float,
+        tried_candidates: int,
+        skipped_candidates: int,
+        covered_entries: int,
+        dictionary_entries: int,
+        unique_hashes: int,
+        is_budget_exhausted: bool,
+        avoided_executions: int = 0,
+    ) -> None:
+        self.valid_arguments = valid_arguments
+        self.executions = executions
+        self.elapsed_time = elapsed_time
+        self.tried_candidates = tried_candidates
+        self.skipped_candidates = skipped_candidates
+        self.covered_entries = covered_entries
+        self.dictionary_entries = dictionary_entries
+        self.unique_hashes = unique_hashes
+        self.is_budget_exhausted = is_budget_exhausted
+        self.avoided_executions = avoided_executions
+
+
+class FuzzingScheduler:
+    binary_tokens: typing.Set[str]
+    corpus: typing.Optional[FuzzingCorpus]
+    corpus_watermark: int
+
+    def __init__(
+        self,
+        executable_filename: str,
+        corpus: typing.Optional[FuzzingCorpus] = None,
+    ) -> None:
+        self.binary_tokens = extract_tokens(executable_filename)
+        self.corpus = corpus
+        self.corpus_watermark = corpus.get_tried_watermark() if corpus else 0
+
+    def get_priority(self, dictionary_entry: str) -> int:
+        # Lower is better. Entries present as strings inside the binary are the
+        # most likely to be parsed by it, and never-tried entries (when a corpus
+        # is attached) are preferred to the ones that were partially fuzzed.
+        is_absent = dictionary_entry not in self.binary_tokens
+        is_tried = bool(
+            self.corpus
+            and self.corpus.is_entry_tried(  # noqa: W503
+                dictionary_entry, self.corpus_watermark
+            )
+        )
+
+        return 2 * is_tried + is_absent
+
+    def prioritize(
+        self, dictionary: typing.Iterable[str]
+    ) -> "PrioritizedDictionary":
+        return PrioritizedDictionary(dictionary, self)
+
+
+class PrioritizedDictionary:
+    dictionary: typing.Iterable[str]
+    scheduler: FuzzingScheduler
+    __buckets: typing.Optional[typing.List[typing.List[str]]]
+
+    def __init__(
+        self, dictionary: typing.Iterable[str], scheduler: FuzzingScheduler
+    ) -> None:
+        self.dictionary = dictionary
+        self.scheduler = scheduler
+        self.__buckets = None
+
+    def __iter__(self) -> typing.Iterator[str]:
+        if self.__buckets is not None:
+            yield from itertools.chain.from_iterable(self.__buckets)
+            return
+
+        # A single pass over the dictionary computes the priorities. The most
+        # promising entries are yielded right away and the other ones are
+        # bucketed, to be yielded afterwards and on the next iterations.
+        buckets = [[] for _ in range(PRIORITY_LEVELS_COUNT)]
+        buffered_entries_count = 0
+        for entry in self.dictionary:
+            priority = self.scheduler.get_priority(entry)
+            if priority == 0:
+                yield entry
+
+            if buckets is not None:
+                buckets[priority].append(entry)
+                buffered_entries_count += 1
+
+                # The memory stays bounded for the large dictionaries, which
+                # are read again for each lower priority instead.
+                if buffered_entries_count > MAX_BUFFERED_ENTRIES:
+                    buckets = None
+
+        if buckets is not None:
+            self.__buckets = buckets
+            yield from itertools.chain.from_iterable(buckets[1:])
+            return
+
+        for level in range(1, PRIORITY_LEVELS_COUNT):
+            for entry in self.dictionary:
+                if self.scheduler.get_priority(entry) == level:
+                    yield entry
+
+    def __len__(self) -> int:
+        if self.__buckets is not None:
+            return sum(len(bucket) for bucket in self.__buckets)
+
+        return count_entries(self.dictionary)
+
+
+def count_entries(dictionary: typing.Iterable[str]) -> int:
+    # The dictionaries knowing their length avoid a whole pass.
+    try:
+        return len(dictionary)
+    except TypeError:
+        return sum(1 for _ in dictionary)
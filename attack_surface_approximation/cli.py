@@ -1,20 +1,76 @@
+# pylint: disable=import-outside-toplevel
+import functools
 import typing
 
 import click
-from rich import print  # pylint: disable=redefined-builtin
-from rich.table import Table
 
-from attack_surface_approximation.arguments_fuzzing import (
-    ArgumentsFuzzer,
-    ArgumentsPair,
-)
 from attack_surface_approximation.dictionaries_generators import (
     ArgumentsGenerator,
 )
-from attack_surface_approximation.static_input_streams_detection import (
-    InputStreamsDetector,
-)
-from commons.input_streams import InputStreams
+from attack_surface_approximation.tracing import trace_span, tracing
+
+AUTHKEY_ENVVAR = "OPENCRS_WORKER_AUTHKEY"
+
+# The subsystems (and rich) are imported only by the commands needing them,
+# as importing Docker, pycparser or pyelftools dominates the startup time.
+if typing.TYPE_CHECKING:
+    from rich.table import Table
+
+    from attack_surface_approximation.arguments_fuzzing import (
+        ArgumentsFuzzer,
+        ArgumentsPair,
+        EnvironmentVariable,
+        FuzzingPlan,
+        FuzzingReport,
+        StaticProfile,
+    )
+    from attack_surface_approximation.arguments_fuzzing.qbdi_analysis import (
+        QBDIAnalysis,
+    )
+    from commons.input_streams import InputStreams
+
+
+def print(*objects: typing.Any) -> None:  # pylint: disable=redefined-builtin
+    import rich
+
+    rich.print(*objects)
+
+
+def escape(text: str) -> str:
+    from rich.markup import escape as escape_markup
+
+    return escape_markup(text)
+
+
+def traceable(command: typing.Callable) -> typing.Callable:
+    @click.option(
+        "--trace",
+        type=click.Path(dir_okay=False, writable=True),
+        required=False,
+        help="Chrome trace (JSON) file with the timed phases of the command",
+    )
+    @click.option(
+        "--profile-dir",
+        type=click.Path(file_okay=False, writable=True),
+        required=False,
+        help="Folder in which a cProfile dump is saved for each phase",
+    )
+    @functools.wraps(command)
+    def wrapper(
+        *args: typing.Any,
+        trace: str = None,
+        profile_dir: str = None,
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        # Commands invoked by other commands are traced by the outer session.
+        if trace is None and profile_dir is None:
+            return command(*args, **kwargs)
+
+        with tracing(trace, profile_dir):
+            with trace_span(f"cli.{command.__name__}", profile=False):
+                return command(*args, **kwargs)
+
+    return wrapper
 
 
 @click.group()
@@ -53,8 +109,44 @@ def cli() -> None:
         " frequency"
     ),
 )
-def generate(heuristic: str, output: str, top: int, elf: str = None) -> None:
+@click.option(
+    "--corpus",
+    "corpus_paths",
+    type=click.Path(exists=True, readable=True),
+    multiple=True,
+    required=False,
+    help=(
+        "File or folder (for example, of ELFs or manuals) harvested in"
+        " parallel, instead of a single ELF. Can be specified multiple times."
+    ),
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    required=False,
+    help="Number of processes harvesting the corpus (default: CPU count)",
+)
+@traceable
+def generate(
+    heuristic: str,
+    output: str,
+    top: int,
+    elf: str = None,
+    corpus_paths: typing.Tuple[str, ...] = (),
+    jobs: int = None,
+) -> None:
+    if elf and corpus_paths:
+        raise click.UsageError("Either an ELF or a corpus can be harvested.")
+
     generator = ArgumentsGenerator()
+
+    if corpus_paths:
+        generate_from_corpus(
+            generator, heuristic, output, top, corpus_paths, jobs
+        )
+
+        return
+
     generator.generate(heuristic, elf)
     arguments_count = generator.dump(output, top_count=top)
 
@@ -63,6 +155,36 @@ def generate(heuristic: str, output: str, top: int, elf: str = None) -> None:
     )
 
 
+def generate_from_corpus(
+    generator: ArgumentsGenerator,
+    heuristic: str,
+    output: str,
+    top: int,
+    corpus_paths: typing.Tuple[str, ...],
+    jobs: typing.Optional[int],
+) -> None:
+    from attack_surface_approximation.dictionaries_generators.corpus_harvester import (
+        DEFAULT_TOP_COUNT,
+        CorpusHarvester,
+    )
+
+    if not CorpusHarvester.is_supported(heuristic):
+        raise click.UsageError(
+            f"The {heuristic} heuristic can not harvest a corpus."
+        )
+
+    # Only the most frequent arguments are kept, to bound the memory.
+    harvested_files = generator.harvest(
+        heuristic, corpus_paths, top or DEFAULT_TOP_COUNT, jobs=jobs
+    )
+    arguments_count = generator.dump(output, sort=False)
+
+    print(
+        f"Successfully generated dictionary with {arguments_count} arguments,"
+        f" ranked by frequency in {harvested_files} files"
+    )
+
+
 @cli.command(
     help="Statically detect what input streams are used by an executable."
 )
@@ -72,14 +194,64 @@ def generate(heuristic: str, output: str, top: int, elf: str = None) -> None:
     required=True,
     help="ELF Executable",
 )
+@traceable
 def detect(elf: str) -> None:
+    from attack_surface_approximation.static_input_streams_detection import (
+        InputStreamsDetector,
+    )
+
     detector = InputStreamsDetector(elf)
     streams = detector.detect_all()
 
     print_detected_streams(streams)
 
 
-def print_detected_streams(streams: InputStreams) -> None:
+@cli.command(
+    name="detect-batch",
+    help=(
+        "Statically detect the input streams of multiple executables, with a"
+        " single Ghidra run."
+    ),
+)
+@click.argument(
+    "elfs",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, readable=True),
+)
+@traceable
+def detect_batch(elfs: typing.Tuple[str, ...]) -> None:
+    from attack_surface_approximation.exceptions import (
+        GhidraNotFoundException,
+        InputStreamsDetectorException,
+    )
+    from attack_surface_approximation.static_input_streams_detection import (
+        InputStreamsDetector,
+    )
+
+    try:
+        detectors, failures = InputStreamsDetector.create_batch(list(elfs))
+    except GhidraNotFoundException as exception:
+        raise click.ClickException(exception.__doc__) from exception
+
+    for elf, detector in detectors.items():
+        try:
+            streams = detector.detect_all()
+        except InputStreamsDetectorException as exception:
+            failures[elf] = exception
+            continue
+
+        print(f"[bold]{escape(elf)}[/bold]")
+        print_detected_streams(streams)
+        print("")
+
+    for elf, exception in failures.items():
+        print(f"[bold]{escape(elf)}[/bold]")
+        print(f"The analysis failed: {escape(exception.__doc__)}")
+        print("")
+
+
+def print_detected_streams(streams: "InputStreams") -> None:
     if not any(streams):
         print_no_detected_stream()
     else:
@@ -110,18 +282,593 @@ def print_multiple_detected_streams(streams: dict) -> None:
     required=True,
     help="Arguments dictionary",
 )
-def fuzz(elf: str, dictionary: str) -> None:
+@click.option(
+    "--corpus",
+    type=click.Path(dir_okay=False, writable=True),
+    required=False,
+    help=(
+        "SQLite database persisting the fuzzing results, such that only new"
+        " dictionary entries are fuzzed on subsequent runs"
+    ),
+)
+@click.option(
+    "--time-budget",
+    type=click.FloatRange(min=0, min_open=True),
+    required=False,
+    help="Maximum duration of the fuzzing, in seconds",
+)
+@click.option(
+    "--exec-budget",
+    type=click.IntRange(min=1),
+    required=False,
+    help="Maximum number of executions of the fuzzed program",
+)
+@click.option(
+    "--timeout-margin",
+    type=click.FloatRange(min=1),
+    required=False,
+    help=(
+        "Safety margin multiplied with the slowest observed execution to"
+        " obtain the per-target timeout"
+    ),
+)
+@click.option(
+    "--static-plan",
+    is_flag=True,
+    default=False,
+    help=(
+        "Statically analyze the executable first, to skip the candidates it"
+        " rules out (or the whole fuzzing, if main() ignores its arguments)"
+    ),
+)
+@click.option(
+    "--harvest-dictionary",
+    is_flag=True,
+    default=False,
+    help=(
+        "Fuzz with the strings to which the executable compares its arguments"
+        " in a few probing runs, instead of the dictionary (kept if nothing"
+        " is harvested)"
+    ),
+)
+@click.option(
+    "--getopt-arities",
+    is_flag=True,
+    default=False,
+    help=(
+        "Parse the getopt tables of the executable, to only fuzz its options"
+        " with the values their arities allow"
+    ),
+)
+@click.option(
+    "--record",
+    type=click.Path(dir_okay=False, writable=True),
+    required=False,
+    help="Cassette (overwritten) in which the analyses' results are recorded",
+)
+@click.option(
+    "--replay",
+    type=click.Path(exists=True, dir_okay=False, readable=True),
+    required=False,
+    help=(
+        "Cassette whose recorded results are replayed instead of running the"
+        " executable, on a simulated clock"
+    ),
+)
+@click.option(
+    "--replay-speedup",
+    type=click.FloatRange(min=0, min_open=True),
+    required=False,
+    help=(
+        "Also wait for the replayed durations, divided by this factor, to"
+        " mimic an accelerated real time"
+    ),
+)
+@click.option(
+    "--execution-log",
+    type=click.Path(dir_okay=False, writable=True),
+    required=False,
+    help=(
+        "Columnar log (overwritten) in which all the executions are recorded,"
+        " for offline analysis"
+    ),
+)
+@click.option(
+    "--worker",
+    "workers",
+    multiple=True,
+    required=False,
+    help=(
+        "Address (HOST:PORT) of a fuzzing worker sharing the fuzzing. Can be"
+        " specified multiple times."
+    ),
+)
+@click.option(
+    "--authkey",
+    envvar=AUTHKEY_ENVVAR,
+    required=False,
+    help=f"Secret shared with the workers (or ${AUTHKEY_ENVVAR})",
+)
+@traceable
+def fuzz(
+    elf: str,
+    dictionary: str,
+    corpus: str = None,
+    time_budget: float = None,
+    exec_budget: int = None,
+    timeout_margin: float = None,
+    record: str = None,
+    replay: str = None,
+    replay_speedup: float = None,
+    execution_log: str = None,
+    workers: typing.Tuple[str, ...] = (),
+    authkey: str = None,
+    static_plan: bool = False,
+    harvest_dictionary: bool = False,
+    getopt_arities: bool = False,
+    static_profile: "StaticProfile" = None,
+) -> typing.Optional["ArgumentsFuzzer"]:
+    # The static profile is not an option, but it is passed by the commands
+    # that already ran the static analysis.
+    from attack_surface_approximation.arguments_fuzzing import (
+        ArgumentsFuzzer,
+        ExecutionLog,
+        FuzzingBudget,
+        FuzzingCorpus,
+    )
+
     generator = ArgumentsGenerator()
     generator.load(dictionary)
     possible_arguments = generator.get_arguments()
 
-    fuzzer = ArgumentsFuzzer(elf, possible_arguments)
-    actual_arguments = fuzzer.get_all_valid_arguments()
+    if workers:
+        if (
+            corpus
+            or time_budget  # noqa: W503
+            or exec_budget  # noqa: W503
+            or timeout_margin  # noqa: W503
+            or execution_log  # noqa: W503
+            or record  # noqa: W503
+            or replay  # noqa: W503
+            or harvest_dictionary  # noqa: W503
+            or getopt_arities  # noqa: W503
+            or static_plan  # noqa: W503
+        ):
+            raise click.UsageError(
+                "The distributed fuzzing supports no corpus, budget, timeout"
+                " margin, execution log, cassette, harvested dictionary,"
+                " options' arities or static plan."
+            )
+        if not authkey:
+            raise click.UsageError("The workers' authkey is missing.")
+
+        print_arguments(
+            fuzz_distributed(elf, possible_arguments, workers, authkey)
+        )
+
+        return None
+
+    if record and replay:
+        raise click.UsageError(
+            "A cassette can be either recorded or replayed."
+        )
+
+    analysis = create_analysis(elf, record, replay, replay_speedup)
+
+    fuzzing_corpus = FuzzingCorpus(corpus, elf) if corpus else None
+    budget = FuzzingBudget(time_budget=time_budget, exec_budget=exec_budget)
+    if replay:
+        budget.clock = analysis.clock
+    log = ExecutionLog(execution_log) if execution_log else None
+
+    # The corpus, the log and the cassette are closed even if the fuzzing
+    # fails, such that the results obtained until then are kept.
+    try:
+        fuzzer = ArgumentsFuzzer(
+            elf,
+            possible_arguments,
+            corpus=fuzzing_corpus,
+            budget=budget,
+            timeout_safety_margin=timeout_margin,
+            analysis=analysis,
+            on_analysis=log.record if log is not None else None,
+            static_profile=static_profile,
+            compute_static_profile=static_plan,
+            harvest_dictionary=harvest_dictionary,
+            option_arities=(
+                extract_option_arities(elf) if getopt_arities else None
+            ),
+        )
+
+        is_bounded = time_budget is not None or exec_budget is not None
+        if is_bounded:
+            for argument in fuzzer.get_valid_argument():
+                print_streamed_argument(argument)
+        else:
+            fuzzer.get_all_valid_arguments()
+    finally:
+        if fuzzing_corpus:
+            fuzzing_corpus.close()
+        if log is not None:
+            log.close()
+        if record:
+            analysis.cassette.close()
+
+    report = fuzzer.get_report()
+    print_arguments(report.valid_arguments)
+    print_fuzzing_plan(fuzzer.plan, report)
+    if harvest_dictionary:
+        print_harvested_dictionary(fuzzer.harvested_dictionary)
+
+    if is_bounded:
+        print_fuzzing_report(report)
+
+    # The fuzzer is returned to the commands invoking this one.
+    return fuzzer
+
+
+def get_default_sample_rate() -> float:
+    from attack_surface_approximation.arguments_fuzzing.differential import (
+        SAMPLE_RATE,
+    )
 
-    print_arguments(actual_arguments)
+    return SAMPLE_RATE
 
 
-def print_arguments(arguments: typing.List[ArgumentsPair]) -> None:
+@cli.command(
+    help=(
+        "Fuzz a new version of an executable, starting from the results of a"
+        " previous one."
+    )
+)
+@click.option(
+    "--elf",
+    type=click.Path(exists=True, readable=True),
+    required=True,
+    help="ELF Executable",
+)
+@click.option(
+    "--previous-elf",
+    type=click.Path(exists=True, readable=True),
+    required=True,
+    help="Previous version of the ELF executable, already fuzzed",
+)
+@click.option(
+    "--dictionary",
+    type=click.Path(exists=True, readable=True),
+    required=True,
+    help="Arguments dictionary",
+)
+@click.option(
+    "--corpus",
+    type=click.Path(dir_okay=False, writable=True),
+    required=True,
+    help="SQLite database holding the results of the previous version",
+)
+@click.option(
+    "--sample-rate",
+    type=click.FloatRange(min=0, max=1),
+    default=get_default_sample_rate,
+    show_default=True,
+    help="Ratio of the entries unrelated to the changes that are re-fuzzed",
+)
+@traceable
+def rescan(
+    elf: str,
+    previous_elf: str,
+    dictionary: str,
+    corpus: str,
+    sample_rate: float,
+) -> None:
+    from attack_surface_approximation.arguments_fuzzing import (
+        DifferentialRescan,
+        FuzzingCorpus,
+        load_previous_arguments,
+    )
+    from attack_surface_approximation.exceptions import (
+        PreviousResultsNotFoundException,
+    )
+
+    try:
+        previous_arguments = load_previous_arguments(corpus, previous_elf)
+    except PreviousResultsNotFoundException as exception:
+        raise click.UsageError(
+            "The corpus holds no results for the previous ELF."
+        ) from exception
+
+    generator = ArgumentsGenerator()
+    generator.load(dictionary)
+
+    fuzzing_corpus = FuzzingCorpus(corpus, elf)
+    try:
+        differential_rescan = DifferentialRescan(
+            elf,
+            previous_elf,
+            previous_arguments,
+            corpus=fuzzing_corpus,
+            sample_rate=sample_rate,
+        )
+        delta = differential_rescan.run(generator.get_arguments())
+    finally:
+        fuzzing_corpus.close()
+
+    print_arguments(delta.kept + delta.gained)
+    print(
+        f"\nRe-fuzzed {differential_rescan.rechecked_entries} previously"
+        f" valid, {differential_rescan.tied_entries} changed and"
+        f" {differential_rescan.sampled_entries} sampled entries, out of"
+        f" {differential_rescan.dictionary_entries}"
+    )
+    print_arguments_delta("Gained", delta.gained)
+    print_arguments_delta("Lost", delta.lost)
+
+
+def print_arguments_delta(
+    title: str, arguments: typing.List["ArgumentsPair"]
+) -> None:
+    if not arguments:
+        print(f"{title} arguments: none")
+        return
+
+    print(f"{title} arguments:")
+    for argument in arguments:
+        roles = ", ".join(role.name for role in argument.valid_roles)
+        print(f"  {escape(argument.to_str())} ({roles})")
+
+
+def validate_environment_variables(
+    _: click.Context, __: click.Parameter, variables: typing.Tuple[str, ...]
+) -> typing.Tuple[str, ...]:
+    from attack_surface_approximation.arguments_fuzzing.harvested_strings import (
+        ENVIRONMENT_VARIABLE_PATTERN,
+    )
+
+    for variable in variables:
+        if not ENVIRONMENT_VARIABLE_PATTERN.fullmatch(variable):
+            raise click.BadParameter(
+                f"{variable} is not a valid environment variable name."
+            )
+
+    return variables
+
+
+@cli.command(help="Fuzz the environment variables read by an executable.")
+@click.option(
+    "--elf",
+    type=click.Path(exists=True, readable=True),
+    required=True,
+    help="ELF Executable",
+)
+@click.option(
+    "--variable",
+    "variables",
+    multiple=True,
+    required=False,
+    callback=validate_environment_variables,
+    help=(
+        "Environment variable fuzzed besides the ones read by the executable."
+        " Can be specified multiple times."
+    ),
+)
+@traceable
+def fuzz_env(elf: str, variables: typing.Tuple[str, ...] = ()) -> None:
+    fuzz_environment(elf, variables)
+
+
+def fuzz_environment(
+    elf: str,
+    variables: typing.Iterable[str],
+    analysis: typing.Optional["QBDIAnalysis"] = None,
+) -> None:
+    from attack_surface_approximation.arguments_fuzzing import (
+        EnvironmentVariablesFuzzer,
+    )
+
+    fuzzer = EnvironmentVariablesFuzzer(elf, variables, analysis=analysis)
+    print_environment_variables(fuzzer.get_all_valid_variables())
+    print(
+        f"\nFuzzed {len(fuzzer.variables)} environment variables in"
+        f" {fuzzer.executions} executions"
+    )
+
+
+def print_environment_variables(
+    variables: typing.List["EnvironmentVariable"],
+) -> None:
+    if not variables:
+        print("No environment variable was detected for the given program.")
+        return
+
+    print(
+        "Several environment variables were detected for the given program:\n"
+    )
+
+    table = build_arguments_table(variables, "Variable")
+    print(table)
+
+
+def extract_option_arities(elf: str) -> typing.Dict[str, int]:
+    from attack_surface_approximation.dictionaries_generators.heuristics import (
+        getopt_parsing,
+    )
+
+    option_arities = dict(getopt_parsing.extract_options(elf))
+    print(f"Parsed the arities of {len(option_arities)} getopt options")
+
+    return option_arities
+
+
+def create_analysis(
+    elf: str,
+    record: typing.Optional[str],
+    replay: typing.Optional[str],
+    replay_speedup: typing.Optional[float],
+) -> typing.Any:
+    from attack_surface_approximation.arguments_fuzzing import (
+        Cassette,
+        ReplayAnalysis,
+    )
+    from attack_surface_approximation.arguments_fuzzing.fuzzer import (
+        ANALYSIS_TIMEOUT,
+    )
+    from attack_surface_approximation.arguments_fuzzing.qbdi_analysis import (
+        QBDIAnalysis,
+    )
+
+    if replay:
+        return ReplayAnalysis(
+            replay, ANALYSIS_TIMEOUT, elf, speedup=replay_speedup
+        )
+
+    if record:
+        return QBDIAnalysis(elf, ANALYSIS_TIMEOUT, cassette=Cassette(record))
+
+    return None
+
+
+def fuzz_distributed(
+    elf: str,
+    possible_arguments: typing.Iterable[str],
+    workers: typing.Tuple[str, ...],
+    authkey: str,
+) -> typing.List["ArgumentsPair"]:
+    from attack_surface_approximation.arguments_fuzzing.distributed import (
+        FuzzingCoordinator,
+        parse_address,
+    )
+
+    coordinator = FuzzingCoordinator(
+        [parse_address(worker) for worker in workers], authkey.encode()
+    )
+
+    return coordinator.fuzz(elf, possible_arguments)
+
+
+@cli.command(help="Serve fuzzing jobs sent by a coordinator.")
+@click.option(
+    "--bind",
+    default="0.0.0.0:6000",
+    show_default=True,
+    help="Address (HOST:PORT) on which the jobs are received",
+)
+@click.option(
+    "--docker-host",
+    required=False,
+    help=(
+        "Docker daemon running the analyses (for example,"
+        " unix:///var/run/docker.sock), instead of the one from environment"
+    ),
+)
+@click.option(
+    "--authkey",
+    envvar=AUTHKEY_ENVVAR,
+    required=True,
+    help=f"Secret shared with the coordinator (or ${AUTHKEY_ENVVAR})",
+)
+@traceable
+def worker(bind: str, authkey: str, docker_host: str = None) -> None:
+    from attack_surface_approximation.arguments_fuzzing.distributed import (
+        FuzzingWorker,
+        parse_address,
+    )
+
+    fuzzing_worker = FuzzingWorker(
+        parse_address(bind), authkey.encode(), docker_host=docker_host
+    )
+    fuzzing_worker.serve_forever(
+        on_ready=lambda address: print(
+            f"Waiting for fuzzing jobs on {address[0]}:{address[1]}"
+        )
+    )
+
+
+@cli.command(
+    name="export-log",
+    help="Export an execution log to NumPy (.npz) or Parquet (.parquet).",
+)
+@click.argument("log", type=click.Path(exists=True, readable=True))
+@click.argument("output", type=click.Path(dir_okay=False, writable=True))
+@traceable
+def export_log(log: str, output: str) -> None:
+    from attack_surface_approximation.arguments_fuzzing.execution_log import (
+        ExecutionLog,
+        export_npz,
+        export_parquet,
+    )
+    from attack_surface_approximation.exceptions import (
+        InvalidExecutionLogException,
+    )
+
+    if output.endswith(".npz"):
+        exporter = export_npz
+    elif output.endswith(".parquet"):
+        exporter = export_parquet
+    else:
+        raise click.BadParameter(
+            "The output needs the .npz or .parquet extension.",
+            param_hint="OUTPUT",
+        )
+
+    try:
+        columns, arguments = ExecutionLog.read(log)
+    except InvalidExecutionLogException as exception:
+        raise click.ClickException(exception.__doc__) from exception
+
+    try:
+        exporter(columns, arguments, output)
+    except ImportError as exception:
+        raise click.ClickException(
+            f"The export needs {exception.name}, from the export extra."
+        ) from exception
+
+    print(
+        f"Successfully exported {len(columns['flags'])} executions of"
+        f" {len(arguments)} distinct arguments"
+    )
+
+
+def print_streamed_argument(argument: "ArgumentsPair") -> None:
+    roles = ", ".join(role.name for role in argument.valid_roles)
+
+    print(f"Found argument: {escape(argument.to_str())} ({roles})")
+
+
+def print_fuzzing_plan(plan: "FuzzingPlan", report: "FuzzingReport") -> None:
+    for family in plan.get_skipped_families():
+        print(f"Skipped candidates, based on the static analysis: {family}")
+
+    if report.avoided_executions:
+        print(f"Avoided executions: {report.avoided_executions}")
+
+
+def print_harvested_dictionary(harvested_dictionary: typing.List[str]) -> None:
+    if not harvested_dictionary:
+        print("No string was harvested, the dictionary was fuzzed instead")
+        return
+
+    print(
+        f"Harvested dictionary ({len(harvested_dictionary)} entries):"
+        f" {escape(' '.join(harvested_dictionary))}"
+    )
+
+
+def print_fuzzing_report(report: "FuzzingReport") -> None:
+    status = (
+        "Budget exhausted, partial results"
+        if report.is_budget_exhausted
+        else "Fuzzing completed"
+    )
+
+    print(
+        f"\n{status}: {report.executions} executions in"
+        f" {report.elapsed_time:.1f}s, {report.tried_candidates} candidates"
+        f" tried ({report.skipped_candidates} skipped as already tried),"
+        f" {report.covered_entries}/{report.dictionary_entries} dictionary"
+        f" entries covered, {report.unique_hashes} unique coverage hashes"
+    )
+
+
+def print_arguments(arguments: typing.List["ArgumentsPair"]) -> None:
     if not arguments:
         print_no_detected_argument()
     else:
@@ -133,7 +880,7 @@ def print_no_detected_argument() -> None:
 
 
 def print_multiple_detected_arguments(
-    arguments: typing.List[ArgumentsPair],
+    arguments: typing.List["ArgumentsPair"],
 ) -> None:
     print("Several arguments were detected for the given program:\n")
 
@@ -141,9 +888,13 @@ def print_multiple_detected_arguments(
     print(table)
 
 
-def build_arguments_table(arguments: typing.List[ArgumentsPair]) -> Table:
+def build_arguments_table(
+    arguments: typing.List["ArgumentsPair"], title: str = "Argument"
+) -> "Table":
+    from rich.table import Table
+
     table = Table()
-    table.add_column("Argument")
+    table.add_column(title)
     table.add_column("Role", justify="center")
 
     for argument in arguments:
@@ -157,7 +908,11 @@ def build_arguments_table(arguments: typing.List[ArgumentsPair]) -> Table:
     return table
 
 
-def build_detected_streams_table(streams: dict) -> Table:
+def build_detected_streams_table(streams: dict) -> "Table":
+    from rich.table import Table
+
+    from commons.input_streams import InputStreams
+
     table = Table()
 
     table.add_column("Stream")
@@ -184,10 +939,29 @@ def build_detected_streams_table(streams: dict) -> Table:
     help="Arguments dictionary",
 )
 @click.pass_context
+@traceable
 def analyze(ctx: click.Context, elf: str, dictionary: str) -> None:
-    ctx.invoke(detect, elf=elf)
+    from attack_surface_approximation.arguments_fuzzing import StaticProfile
+    from attack_surface_approximation.static_input_streams_detection import (
+        InputStreamsDetector,
+    )
+
+    # The static results are reused to plan the fuzzing.
+    detector = InputStreamsDetector(elf)
+    print_detected_streams(detector.detect_all())
     print("")
-    ctx.invoke(fuzz, elf=elf, dictionary=dictionary)
+    fuzzer = ctx.invoke(
+        fuzz,
+        elf=elf,
+        dictionary=dictionary,
+        static_profile=StaticProfile.from_detector(detector),
+    )
+
+    # The environment is fuzzed with the analysis of the arguments' fuzzing
+    # and the variables read during its baseline runs.
+    if detector.uses_env():
+        print("")
+        fuzz_environment(elf, fuzzer.environment_variables, fuzzer.analysis)
 
 
 def main() -> None:
@@ -5,6 +5,10 @@ class Configuration:
 
     class Fuzzer:
         GENERATE_RANDOM_BASELINE_ARGUMENTS = False
+        ADAPTIVE_TIMEOUT = True
+        TIMEOUT_SAFETY_MARGIN = 4
+        MIN_ANALYSIS_TIMEOUT = 0.5
+        CONFIRMATION_TIMEOUT_FACTOR = 4
 
     class QBDIAnalysis:
         IMAGE_TAG = "qbdi_args_fuzzing"
@@ -1,3 +1,9 @@
 from attack_surface_approximation.dictionaries_generators.generator import (
     ArgumentsGenerator,
 )
+from attack_surface_approximation.dictionaries_generators.dictionary_reader import (
+    DictionaryReader,
+)
+from attack_surface_approximation.dictionaries_generators.corpus_harvester import (
+    CorpusHarvester,
+)
@@ -0,0 +1,209 @@
+import array
+import hashlib
+import importlib
+import itertools
+import math
+import multiprocessing
+import os
+import typing
+from collections import Counter
+
+from attack_surface_approximation.dictionaries_generators.generator import (
+    HEURISTICS_PACKAGE,
+)
+
+HARVEST_FUNCTION_NAME = "harvest"
+BATCH_SIZE = 64
+DEFAULT_TOP_COUNT = 10000
+SKETCH_ERROR_RATE = 1e-4
+SKETCH_FAILURE_PROBABILITY = 1e-3
+CANDIDATES_FACTOR = 2
+
+
+class CountMinSketch:
+    width: int
+    depth: int
+    __rows: typing.List[array.array]
+
+    def __init__(self, error_rate: float, failure_probability: float) -> None:
+        # An estimate exceeds the real count with at most error_rate * total,
+        # with a probability of 1 - failure_probability.
+        self.width = math.ceil(math.e / error_rate)
+        self.depth = math.ceil(math.log(1 / failure_probability))
+        self.__rows = [
+            array.array("Q", bytes(8 * self.width)) for _ in range(self.depth)
+        ]
+
+    def __get_positions(self, element: str) -> typing.Iterator[int]:
+        digest = hashlib.blake2b(
+            element.encode("utf-8", errors="surrogatepass"), digest_size=16
+        ).digest()
+        first_hash = int.from_bytes(digest[:8], "little")
+        second_hash = int.from_bytes(digest[8:], "little") | 1
+
+        for index in range(self.depth):
+            yield (first_hash + index * second_hash) % self.width
+
+    def add(self, element: str, count: int = 1) -> int:
+        estimate = None
+        for row, position in zip(self.__rows, self.__get_positions(element)):
+            row[position] += count
+
+            if estimate is None or row[position] < estimate:
+                estimate = row[position]
+
+        return estimate
+
+    def estimate(self, element: str) -> int:
+        return min(
+            row[position]
+            for row, position in zip(
+                self.__rows, self.__get_positions(element)
+            )
+        )
+
+
+class TopKCounter:
+    top_count: int
+    sketch: CountMinSketch
+    __candidates: typing.Dict[str, int]
+    __admission_threshold: int
+
+    def __init__(
+        self,
+        top_count: int,
+        error_rate: float = SKETCH_ERROR_RATE,
+        failure_probability: float = SKETCH_FAILURE_PROBABILITY,
+    ) -> None:
+        self.top_count = top_count
+        self.sketch = CountMinSketch(error_rate, failure_probability)
+        self.__candidates = {}
+        self.__admission_threshold = 0
+
+    def __prune(self) -> None:
+        kept_candidates = self.get_most_common()
+        self.__candidates = dict(kept_candidates)
+        self.__admission_threshold = kept_candidates[-1][1]
+
+    def update(self, counts: typing.Mapping[str, int]) -> None:
+        # The sketch holds all the (estimated) counts, so an element evicted
+        # from the candidates enters back with its whole history.
+        for element, count in counts.items():
+            estimate = self.sketch.add(element, count)
+
+            if (
+                element in self.__candidates
+                or estimate > self.__admission_threshold  # noqa: W503
+            ):
+                self.__candidates[element] = estimate
+
+        if len(self.__candidates) >= CANDIDATES_FACTOR * self.top_count:
+            self.__prune()
+
+    def get_most_common(self) -> typing.List[typing.Tuple[str, int]]:
+        ranked_candidates = sorted(
+            self.__candidates.items(), key=lambda item: (-item[1], item[0])
+        )
+
+        return ranked_candidates[: self.top_count]
+
+
+def iterate_files(paths: typing.Iterable[str]) -> typing.Iterator[str]:
+    # A file reached through multiple symlinks (for example, busybox applets)
+    # is harvested once, such that its arguments are not counted repeatedly.
+    seen_files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            filenames = (
+                os.path.join(folder, filename)
+                for folder, _, folder_filenames in os.walk(path)
+                for filename in sorted(folder_filenames)
+            )
+        else:
+            filenames = [path]
+
+        for filename in filenames:
+            real_filename = os.path.realpath(filename)
+            if real_filename in seen_files:
+                continue
+
+            seen_files.add(real_filename)
+            yield filename
+
+
+def iterate_batches(
+    filenames: typing.Iterator[str],
+) -> typing.Iterator[typing.List[str]]:
+    while batch := list(itertools.islice(filenames, BATCH_SIZE)):
+        yield batch
+
+
+def harvest_batch(
+    arguments: typing.Tuple[str, typing.List[str]],
+) -> typing.Tuple[int, typing.Counter[str]]:
+    heuristic_id, filenames = arguments
+    heuristic_module = importlib.import_module(
+        f"{HEURISTICS_PACKAGE}.{heuristic_id}"
+    )
+    harvest = getattr(heuristic_module, HARVEST_FUNCTION_NAME)
+
+    # The arguments are counted once per file, such that the ones shared by
+    # many programs rank first.
+    counts = Counter()
+    harvested_files = 0
+    for filename in filenames:
+        try:
+            counts.update(set(harvest(filename)))
+        except (OSError, EOFError):
+            continue
+
+        harvested_files += 1
+
+    return harvested_files, counts
+
+
+class CorpusHarvester:
+    heuristic_id: str
+    jobs: int
+    top_count: int
+    harvested_files: int
+
+    def __init__(
+        self,
+        heuristic_id: str,
+        top_count: int,
+        jobs: typing.Optional[int] = None,
+    ) -> None:
+        self.heuristic_id = heuristic_id
+        self.top_count = top_count
+        self.jobs = jobs if jobs else os.cpu_count()
+        self.harvested_files = 0
+
+    @staticmethod
+    def is_supported(heuristic_id: str) -> bool:
+        heuristic_module = importlib.import_module(
+            f"{HEURISTICS_PACKAGE}.{heuristic_id}"
+        )
+
+        return hasattr(heuristic_module, HARVEST_FUNCTION_NAME)
+
+    def harvest(
+        self, paths: typing.Iterable[str]
+    ) -> typing.List[typing.Tuple[str, int]]:
+        top_counter = TopKCounter(self.top_count)
+
+        batches = (
+            (self.heuristic_id, batch)
+            for batch in iterate_batches(iterate_files(paths))
+        )
+
+        # Each worker maps a batch of files to their arguments' counts, which
+        # are reduced into the bounded top-k as soon as they are ready.
+        with multiprocessing.Pool(self.jobs) as pool:
+            for harvested_files, counts in pool.imap_unordered(
+                harvest_batch, batches
+            ):
+                self.harvested_files += harvested_files
+                top_counter.update(counts)
+
+        return top_counter.get_most_common()
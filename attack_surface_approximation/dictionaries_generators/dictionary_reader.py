@@ -0,0 +1,105 @@
+import hashlib
+import math
+import typing
+
+FALSE_POSITIVE_RATE = 1e-6
+MIN_BLOOM_FILTER_SIZE = 64
+
+
+class BloomFilter:
+    __bits: bytearray
+    size: int
+    hashes_count: int
+
+    def __init__(self, capacity: int, false_positive_rate: float) -> None:
+        capacity = max(capacity, 1)
+
+        self.size = max(
+            MIN_BLOOM_FILTER_SIZE,
+            math.ceil(
+                -capacity * math.log(false_positive_rate) / math.log(2) ** 2
+            ),
+        )
+        self.hashes_count = max(1, round(self.size / capacity * math.log(2)))
+        self.__bits = bytearray((self.size + 7) // 8)
+
+    def __get_positions(
+        self, element: str
+    ) -> typing.Generator[int, None, None]:
+        # Double hashing, with both hashes extracted from a single digest
+        digest = hashlib.blake2b(
+            element.encode("utf-8", errors="surrogatepass"), digest_size=16
+        ).digest()
+        first_hash = int.from_bytes(digest[:8], "little")
+        second_hash = int.from_bytes(digest[8:], "little") | 1
+
+        for index in range(self.hashes_count):
+            yield (first_hash + index * second_hash) % self.size
+
+    def add(self, element: str) -> bool:
+        is_present = True
+        for position in self.__get_positions(element):
+            byte_index, bit_mask = position >> 3, 1 << (position & 7)
+
+            if not self.__bits[byte_index] & bit_mask:
+                is_present = False
+                self.__bits[byte_index] |= bit_mask
+
+        return is_present
+
+
+class DictionaryReader:
+    filename: str
+    false_positive_rate: float
+    __lines_count: typing.Optional[int]
+    __entries_count: typing.Optional[int]
+
+    def __init__(
+        self,
+        filename: str,
+        false_positive_rate: float = FALSE_POSITIVE_RATE,
+    ) -> None:
+        self.filename = filename
+        self.false_positive_rate = false_positive_rate
+        self.__lines_count = None
+        self.__entries_count = None
+
+    @staticmethod
+    def normalize(line: str) -> str:
+        return line.strip()
+
+    def __open(self) -> typing.TextIO:
+        return open(self.filename, "r", encoding="utf-8", errors="replace")
+
+    def __count_lines(self) -> int:
+        if self.__lines_count is None:
+            with self.__open() as dictionary:
+                self.__lines_count = sum(1 for _ in dictionary)
+
+        return self.__lines_count
+
+    def __iter__(self) -> typing.Iterator[str]:
+        # The deduplication is probabilistic, such that the memory does not
+        # depend on the entries' lengths. A false positive only drops an entry.
+        seen_entries = BloomFilter(
+            self.__count_lines(), self.false_positive_rate
+        )
+
+        entries_count = 0
+        with self.__open() as dictionary:
+            for line in dictionary:
+                entry = self.normalize(line)
+                if not entry or seen_entries.add(entry):
+                    continue
+
+                entries_count += 1
+                yield entry
+
+        self.__entries_count = entries_count
+
+    def __len__(self) -> int:
+        # The count is remembered from the last complete iteration.
+        if self.__entries_count is None:
+            self.__entries_count = sum(1 for _ in self)
+
+        return self.__entries_count
@@ -1,43 +1,60 @@
 import importlib
+import importlib.util
 import pkgutil
 import typing
 from collections import Counter
 
-import attack_surface_approximation.dictionaries_generators.heuristics
+from attack_surface_approximation.dictionaries_generators.dictionary_reader import (
+    DictionaryReader,
+)
+from attack_surface_approximation.tracing import trace_span, traced
+
+HEURISTICS_PACKAGE = (
+    "attack_surface_approximation.dictionaries_generators.heuristics"
+)
 
 
 class TopFilter:
     def __init__(self, top: int, /) -> None:
         self.top = top
 
-    def filter(self, elements: typing.List[str]) -> typing.List[str]:
+    def filter(self, elements: typing.Iterable[str]) -> typing.List[str]:
         counter = Counter(elements)
 
         return [element for element, _ in counter.most_common(self.top)]
 
 
 class ArgumentsGenerator:
-    arguments: typing.List[str]
+    arguments: typing.Iterable[str]
 
     def __init__(self) -> None:
         self.arguments = []
 
     @staticmethod
     def get_available_heuristics() -> typing.Generator[str, None, None]:
+        # The heuristics are only located, neither them nor their package being
+        # imported, as they depend on heavier modules.
+        heuristics_spec = importlib.util.find_spec(HEURISTICS_PACKAGE)
+
         for _, name, _ in pkgutil.iter_modules(
-            attack_surface_approximation.dictionaries_generators.heuristics.__path__
+            heuristics_spec.submodule_search_locations
         ):
             yield name
 
-    def load(self, dictionary_name: str) -> None:
-        with open(dictionary_name, "r", encoding="utf-8") as dictionary:
-            self.arguments = dictionary.read().strip()
-            self.arguments = self.arguments.split("\n")
+    def load(self, dictionary_name: str) -> DictionaryReader:
+        # The entries are lazily read, normalized and deduplicated on each
+        # iteration, so arbitrarily large dictionaries can be used.
+        self.arguments = DictionaryReader(dictionary_name)
+
+        return self.arguments
 
-    def get_arguments(self) -> typing.List[str]:
+    def get_arguments(self) -> typing.Iterable[str]:
         return self.arguments
 
-    def dump(self, output_file: str, top_count: int = 0) -> int:
+    @traced("ArgumentsGenerator.dump")
+    def dump(
+        self, output_file: str, top_count: int = 0, sort: bool = True
+    ) -> int:
         if top_count != 0:
             top_filter = TopFilter(top_count)
             filter_func = getattr(top_filter, "filter", None)
@@ -46,7 +63,8 @@ class ArgumentsGenerator:
             filtered_args = self.arguments
 
         arguments = list(filtered_args)
-        arguments.sort()
+        if sort:
+            arguments.sort()
 
         arguments = [argument + "\n" for argument in arguments]
 
@@ -54,10 +72,32 @@ class ArgumentsGenerator:
 
         return len(arguments)
 
+    @traced("ArgumentsGenerator.generate")
     def generate(self, heuristic_id: str, elf: str) -> None:
-        heuristic_module = importlib.import_module(
-            "attack_surface_approximation.dictionaries_generators"
-            f".heuristics.{heuristic_id}"
+        with trace_span("heuristic.import", heuristic=heuristic_id):
+            heuristic_module = importlib.import_module(
+                f"{HEURISTICS_PACKAGE}.{heuristic_id}"
+            )
+
+        with trace_span("heuristic.generate", heuristic=heuristic_id):
+            self.arguments = heuristic_module.generate(elf)
+
+    @traced("ArgumentsGenerator.harvest")
+    def harvest(
+        self,
+        heuristic_id: str,
+        paths: typing.Iterable[str],
+        top_count: int,
+        jobs: typing.Optional[int] = None,
+    ) -> int:
+        # pylint: disable=import-outside-toplevel
+        from attack_surface_approximation.dictionaries_generators import (
+            corpus_harvester,
+        )
+
+        harvester = corpus_harvester.CorpusHarvester(
+            heuristic_id, top_count, jobs=jobs
         )
+        self.arguments = [argument for argument, _ in harvester.harvest(paths)]
 
-        self.arguments = heuristic_module.generate(elf)
+        return harvester.harvested_files
@@ -10,3 +10,7 @@ def generate(elf: str = None) -> typing.List[str]:
     arguments = re.findall(ARGUMENTS_PATTERN.encode("utf-8"), content)
 
     return [arg.decode("utf-8") for arg in arguments]
+
+
+def harvest(filename: str) -> typing.List[str]:
+    return generate(filename)
@@ -0,0 +1,472 @@
+import re
+import typing
+
+from attack_surface_approximation.getopt_options import (
+    ARITIES,
+    HarvestedOption,
+    decode_optstring,
+)
+
+if typing.TYPE_CHECKING:
+    from elftools.elf.elffile import ELFFile
+
+OPTSTRING_PATTERN = re.compile(r"[+-]?:?(?:W;|[A-Za-z0-9?]:{0,2})+")
+LONG_OPTION_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]*")
+GETOPT_FUNCTIONS = ["getopt", "getopt_long", "getopt_long_only"]
+MAX_STRING_LENGTH = 256
+MAX_LONG_OPTIONS = 1024
+CALL_SITE_WINDOW = 96
+FUNCTION_WINDOW = 1024
+MAX_REGISTER_COPIES = 2
+RELATIVE_RELOCATION_TYPE = 8
+ENDBR_LENGTH = 4
+ENDBR_INSTRUCTIONS = [b"\xf3\x0f\x1e\xfa", b"\xf3\x0f\x1e\xfb"]
+BND_PREFIX = 0xF2
+PLT_SECTIONS = [".plt", ".plt.sec", ".plt.got"]
+
+# Calls, either direct or through the GOT
+DIRECT_CALL_PATTERN = re.compile(rb"(?=\xe8(....))", re.DOTALL)
+INDIRECT_CALL_PATTERN = re.compile(rb"(?=\xff\x15(....))", re.DOTALL)
+PLT_JUMP_PATTERN = re.compile(rb"(?=\xff([\x25\xa3])(....))", re.DOTALL)
+
+# Kinds of the constant addresses loaded by the instructions
+ABSOLUTE_ADDRESS = "absolute"
+RIP_RELATIVE_ADDRESS = "rip_relative"
+GOT_RELATIVE_ADDRESS = "got_relative"
+RIP_RELATIVE_LOAD_LENGTH = 7
+
+# Registers holding the third (optstring) and the fourth (longopts)
+# arguments, in the System V AMD64 calling convention
+OPTSTRING_REGISTER = 2
+LONG_OPTIONS_REGISTER = 1
+
+# mov reg, reg, in both of its encodings
+REGISTER_COPY_PATTERN = re.compile(
+    rb"(?=([\x48-\x4f])([\x89\x8b])([\xc0-\xff]))"
+)
+
+# Stores of constant addresses into the stack (push imm32 and
+# mov [esp + disp8], imm32) and GOT-relative loads (lea reg, [ebx + disp32]),
+# in the i386 cdecl calling convention
+I386_LOADS = [
+    (re.compile(rb"(?=\x68(....))", re.DOTALL), ABSOLUTE_ADDRESS),
+    (
+        re.compile(rb"(?=\xc7\x44\x24[\x08\x0c](....))", re.DOTALL),
+        ABSOLUTE_ADDRESS,
+    ),
+    (
+        re.compile(
+            rb"(?=\x8d[\x83\x8b\x93\x9b\xab\xb3\xbb](....))", re.DOTALL
+        ),
+        GOT_RELATIVE_ADDRESS,
+    ),
+]
+
+LoadPattern = typing.Tuple[typing.Pattern, str]
+
+# Position of a write and either the loaded address or the copied register
+RegisterWrite = typing.Tuple[int, typing.Optional[int], typing.Optional[int]]
+
+
+def to_signed(value: int) -> int:
+    return value - 2**32 if value >= 2**31 else value
+
+
+def get_register_load_patterns(register: int) -> typing.List[LoadPattern]:
+    # lea reg, [rip + disp32] and mov reg, imm32
+    low_bits = register & 7
+    lea = bytes([0x4C if register >= 8 else 0x48, 0x8D, 0x05 | low_bits << 3])
+    mov = (b"\x41" if register >= 8 else b"") + bytes([0xB8 | low_bits])
+
+    return [
+        (
+            re.compile(b"(?=" + re.escape(lea) + b"(....))", re.DOTALL),
+            RIP_RELATIVE_ADDRESS,
+        ),
+        (
+            re.compile(b"(?=" + re.escape(mov) + b"(....))", re.DOTALL),
+            ABSOLUTE_ADDRESS,
+        ),
+    ]
+
+
+def decode_register_copy(match: typing.Match) -> typing.Tuple[int, int]:
+    prefix, opcode, modrm = (group[0] for group in match.groups())
+    reg = (modrm >> 3 & 7) | (prefix & 4) << 1
+    rm = (modrm & 7) | (prefix & 1) << 3
+
+    # The destination is the first operand of 0x89 and the second of 0x8b.
+    return (rm, reg) if opcode == 0x89 else (reg, rm)
+
+
+class ExecutableImage:
+    is_64_bits: bool
+    word_size: int
+    __sections: typing.List[typing.Tuple[int, bytes]]
+    __relative_relocations: typing.Dict[int, int]
+    __got_slots: typing.Dict[int, str]
+    __got_address: int
+
+    def __init__(self, elf: "ELFFile") -> None:
+        self.is_64_bits = elf.elfclass == 64
+        self.word_size = elf.elfclass // 8
+        self.__sections = [
+            (section["sh_addr"], section.data())
+            for section in elf.iter_sections()
+            if section["sh_addr"] and section["sh_type"] != "SHT_NOBITS"
+        ]
+        self.__relative_relocations = {}
+        self.__got_slots = {}
+        self.__read_relocations(elf)
+
+        got_section = elf.get_section_by_name(".got.plt") or (
+            elf.get_section_by_name(".got")
+        )
+        self.__got_address = got_section["sh_addr"] if got_section else 0
+
+    def __read_relocations(self, elf: "ELFFile") -> None:
+        # pylint: disable=import-outside-toplevel
+        from elftools.elf.relocation import RelocationSection
+
+        for section in elf.iter_sections():
+            if not isinstance(section, RelocationSection):
+                continue
+
+            symbols = elf.get_section(section["sh_link"])
+            for relocation in section.iter_relocations():
+                # In position independent executables, the pointers are only
+                # known after the relative relocations.
+                if relocation["r_info_type"] == RELATIVE_RELOCATION_TYPE:
+                    self.__relative_relocations[relocation["r_offset"]] = (
+                        relocation["r_addend"]
+                        if relocation.is_RELA()
+                        else self.read_word(relocation["r_offset"])
+                    )
+                elif relocation["r_info_sym"] and symbols:
+                    symbol = symbols.get_symbol(relocation["r_info_sym"])
+                    self.__got_slots[relocation["r_offset"]] = symbol.name
+
+    def read(self, address: int, size: int) -> typing.Optional[bytes]:
+        for start, data in self.__sections:
+            if start <= address < start + len(data):
+                offset = address - start
+
+                return data[offset : offset + size]
+
+        return None
+
+    def read_word(self, address: int, size: int = 0) -> typing.Optional[int]:
+        size = size if size else self.word_size
+        data = self.read(address, size)
+        if data is None or len(data) != size:
+            return None
+
+        return int.from_bytes(data, "little")
+
+    def read_pointer(self, address: int) -> typing.Optional[int]:
+        if address in self.__relative_relocations:
+            return self.__relative_relocations[address]
+
+        return self.read_word(address)
+
+    def read_string(self, address: int) -> typing.Optional[str]:
+        data = self.read(address, MAX_STRING_LENGTH)
+        if not data or b"\x00" not in data:
+            return None
+
+        try:
+            return data[: data.index(b"\x00")].decode("ascii")
+        except UnicodeDecodeError:
+            return None
+
+    def get_got_slot_symbol(self, address: int) -> typing.Optional[str]:
+        return self.__got_slots.get(address)
+
+    def imports_any(self, names: typing.List[str]) -> bool:
+        return any(name in names for name in self.__got_slots.values())
+
+    def resolve_got_relative(self, displacement: int) -> int:
+        return self.__got_address + to_signed(displacement)
+
+
+class GetoptTablesParser:
+    image: ExecutableImage
+    __elf: "ELFFile"
+    __getopt_addresses: typing.Set[int]
+
+    def __init__(self, elf: "ELFFile") -> None:
+        self.__elf = elf
+        self.image = ExecutableImage(elf)
+        self.__getopt_addresses = set()
+
+    def __find_plt_stubs(self) -> None:
+        # The PLT stubs jump to the addresses from the GOT slots, which are
+        # relocated to the imported functions.
+        for name in PLT_SECTIONS:
+            section = self.__elf.get_section_by_name(name)
+            if not section:
+                continue
+
+            code = section.data()
+            for match in PLT_JUMP_PATTERN.finditer(code):
+                position = match.start()
+                address = section["sh_addr"] + position
+                displacement = int.from_bytes(match.group(2), "little")
+
+                if match.group(1) == b"\xa3":
+                    slot = self.image.resolve_got_relative(displacement)
+                elif self.image.is_64_bits:
+                    slot = address + 6 + to_signed(displacement)
+                else:
+                    slot = displacement
+
+                if self.image.get_got_slot_symbol(slot) in GETOPT_FUNCTIONS:
+                    self.__getopt_addresses.add(
+                        self.__get_stub_start(code, position, address)
+                    )
+
+    @staticmethod
+    def __get_stub_start(code: bytes, position: int, address: int) -> int:
+        if position and code[position - 1] == BND_PREFIX:
+            position -= 1
+            address -= 1
+
+        if code[position - ENDBR_LENGTH : position] in ENDBR_INSTRUCTIONS:
+            address -= ENDBR_LENGTH
+
+        return address
+
+    def __find_getopt_symbols(self) -> None:
+        # pylint: disable=import-outside-toplevel
+        from elftools.elf.sections import SymbolTableSection
+
+        # Statically linked executables contain the functions themselves.
+        for section in self.__elf.iter_sections():
+            if not isinstance(section, SymbolTableSection):
+                continue
+
+            for symbol in section.iter_symbols():
+                if symbol.name in GETOPT_FUNCTIONS and symbol["st_value"]:
+                    self.__getopt_addresses.add(symbol["st_value"])
+
+    def __find_call_sites(
+        self, text_address: int, text: bytes
+    ) -> typing.List[int]:
+        call_sites = []
+
+        for match in DIRECT_CALL_PATTERN.finditer(text):
+            position = match.start()
+            target = (
+                text_address
+                + position
+                + 5
+                + to_signed(int.from_bytes(match.group(1), "little"))
+            )
+
+            if target in self.__getopt_addresses:
+                call_sites.append(position)
+
+        # The calls through the GOT are emitted without a PLT (-fno-plt).
+        for match in INDIRECT_CALL_PATTERN.finditer(text):
+            position = match.start()
+            displacement = int.from_bytes(match.group(1), "little")
+            slot = (
+                text_address + position + 6 + to_signed(displacement)
+                if self.image.is_64_bits
+                else displacement
+            )
+
+            if self.image.get_got_slot_symbol(slot) in GETOPT_FUNCTIONS:
+                call_sites.append(position)
+
+        return call_sites
+
+    def __find_loaded_addresses(
+        self,
+        code_address: int,
+        code: bytes,
+        load_patterns: typing.List[LoadPattern],
+    ) -> typing.List[typing.Tuple[int, int]]:
+        loads = []
+        for pattern, address_kind in load_patterns:
+            for match in pattern.finditer(code):
+                value = int.from_bytes(match.group(1), "little")
+
+                if address_kind == RIP_RELATIVE_ADDRESS:
+                    value = (
+                        code_address
+                        + match.start()
+                        + RIP_RELATIVE_LOAD_LENGTH
+                        + to_signed(value)
+                    )
+                elif address_kind == GOT_RELATIVE_ADDRESS:
+                    value = self.image.resolve_got_relative(value)
+
+                loads.append((match.start(), value))
+
+        return loads
+
+    def __find_register_writes(
+        self, code_address: int, code: bytes, register: int
+    ) -> typing.List[RegisterWrite]:
+        writes = [
+            (position, address, None)
+            for position, address in self.__find_loaded_addresses(
+                code_address, code, get_register_load_patterns(register)
+            )
+        ]
+
+        for match in REGISTER_COPY_PATTERN.finditer(code):
+            destination, source = decode_register_copy(match)
+            if destination == register and source != register:
+                writes.append((match.start(), None, source))
+
+        return writes
+
+    def __find_register_value(
+        self, text_address: int, text: bytes, position: int, register: int
+    ) -> typing.Optional[int]:
+        # The last write before the call sets the register, either to a
+        # constant address or to another register, loaded earlier (for
+        # example, before the loop parsing the arguments).
+        window = CALL_SITE_WINDOW
+        for _ in range(MAX_REGISTER_COPIES + 1):
+            start = max(0, position - window)
+            writes = self.__find_register_writes(
+                text_address + start, text[start:position], register
+            )
+            if not writes:
+                return None
+
+            write_position, address, source = max(
+                writes, key=lambda write: write[0]
+            )
+            if address is not None:
+                return address
+
+            position = start + write_position
+            register = source
+            window = FUNCTION_WINDOW
+
+        return None
+
+    def __decode_long_options(
+        self, address: int
+    ) -> typing.Optional[typing.List[HarvestedOption]]:
+        # Each struct option holds a name pointer, the has_arg integer, a flag
+        # pointer and a value, aligned on words.
+        record_size = 4 * self.image.word_size
+        options = []
+
+        for index in range(MAX_LONG_OPTIONS):
+            record_address = address + index * record_size
+            name_address = self.image.read_pointer(record_address)
+            if name_address is None:
+                return None
+            if name_address == 0:
+                return options if options else None
+
+            name = self.image.read_string(name_address)
+            has_arg = self.image.read_word(
+                record_address + self.image.word_size, 4
+            )
+            if (
+                name is None
+                or not LONG_OPTION_PATTERN.fullmatch(name)  # noqa: W503
+                or has_arg not in ARITIES  # noqa: W503
+            ):
+                return None
+
+            options.append(("--" + name, has_arg))
+
+        return None
+
+    def __decode_optstring(
+        self, address: int
+    ) -> typing.Optional[typing.List[HarvestedOption]]:
+        optstring = self.image.read_string(address)
+        if not optstring or not OPTSTRING_PATTERN.fullmatch(optstring):
+            return None
+
+        return decode_optstring(optstring)
+
+    def __parse_call_site(
+        self, text_address: int, text: bytes, position: int
+    ) -> typing.List[HarvestedOption]:
+        if self.image.is_64_bits:
+            optstring_addresses = [
+                self.__find_register_value(
+                    text_address, text, position, OPTSTRING_REGISTER
+                )
+            ]
+            long_options_addresses = [
+                self.__find_register_value(
+                    text_address, text, position, LONG_OPTIONS_REGISTER
+                )
+            ]
+        else:
+            # The arguments' order is not known from the stores, but the
+            # optstrings and the tables are told apart by their contents.
+            start = max(0, position - CALL_SITE_WINDOW)
+            optstring_addresses = [
+                address
+                for _, address in self.__find_loaded_addresses(
+                    text_address + start, text[start:position], I386_LOADS
+                )
+            ]
+            long_options_addresses = optstring_addresses
+
+        options = []
+        for address in long_options_addresses:
+            if address is not None:
+                options.extend(self.__decode_long_options(address) or [])
+        for address in optstring_addresses:
+            if address is not None:
+                options.extend(self.__decode_optstring(address) or [])
+
+        return options
+
+    def parse(self) -> typing.List[HarvestedOption]:
+        self.__find_plt_stubs()
+        self.__find_getopt_symbols()
+        if not self.__getopt_addresses and not self.image.imports_any(
+            GETOPT_FUNCTIONS
+        ):
+            return []
+
+        text_section = self.__elf.get_section_by_name(".text")
+        if not text_section:
+            return []
+        text_address = text_section["sh_addr"]
+        text = text_section.data()
+
+        options = {}
+        for position in self.__find_call_sites(text_address, text):
+            for option, has_arg in self.__parse_call_site(
+                text_address, text, position
+            ):
+                options.setdefault(option, has_arg)
+
+        return list(options.items())
+
+
+def extract_options(elf: str) -> typing.List[HarvestedOption]:
+    # pylint: disable=import-outside-toplevel
+    from elftools.elf.elffile import ELFFile
+
+    with open(elf, "rb") as elf_file:
+        return GetoptTablesParser(ELFFile(elf_file)).parse()
+
+
+def generate(elf: str = None) -> typing.List[str]:
+    return [option for option, _ in extract_options(elf)]
+
+
+def harvest(filename: str) -> typing.List[str]:
+    # pylint: disable=import-outside-toplevel
+    from elftools.common.exceptions import ELFError
+
+    try:
+        return generate(filename)
+    except ELFError:
+        return []
@@ -21,11 +21,11 @@ def __get_arguments_from_manual(
     filter_func: typing.Callable,
     unescape: typing.Callable = None,
 ) -> typing.Generator[str, None, None]:
-    with gzip.open(filename, "rt") as manual:
-        try:
-            content = manual.read()
-        except UnicodeDecodeError:
-            return
+    opener = gzip.open if filename.endswith(".gz") else open
+    # The manuals that are not encoded in UTF-8 are still parsed, as their
+    # options are ASCII.
+    with opener(filename, "rt", encoding="utf-8", errors="replace") as manual:
+        content = manual.read()
 
         if unescape:
             content = unescape(content)
@@ -45,3 +45,9 @@ def generate(_: str = None) -> typing.List[str]:
     return all_arguments
 
     return all_arguments
+
+
+def harvest(filename: str) -> typing.Generator[str, None, None]:
+    yield from __get_arguments_from_manual(
+        filename, __find_arguments, unescape=__unescape_bash_string
+    )
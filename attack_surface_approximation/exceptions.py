@@ -13,3 +13,39 @@ class NotELFFileException(InputStreamsDetectorException):
 class MainNotFoundException(InputStreamsDetectorException):
     """The main function could not be found. Check if the binary is stripped.
     """
+
+
+class StaticAnalysisFailedException(InputStreamsDetectorException):
+    """The static analysis of the provided ELF file produced no result."""
+
+
+class DecompilationParsingException(InputStreamsDetectorException):
+    """The decompiled main function could not be parsed."""
+
+
+class GhidraNotFoundException(InputStreamsDetectorException):
+    """The headless analyzer of Ghidra could not be found."""
+
+
+class ArgumentsFuzzerException(Exception):
+    """Generic exception"""
+
+
+class WorkerFailedException(ArgumentsFuzzerException):
+    """A fuzzing worker could not be reached or failed to fuzz its job."""
+
+
+class InvalidExecutionLogException(ArgumentsFuzzerException):
+    """The provided file is not an execution log."""
+
+
+class CassetteMissException(ArgumentsFuzzerException):
+    """The replayed argument was not recorded in the cassette."""
+
+
+class InvalidEnvironmentVariableException(ArgumentsFuzzerException):
+    """The provided name is not a valid environment variable name."""
+
+
+class PreviousResultsNotFoundException(ArgumentsFuzzerException):
+    """The corpus holds no results for the previous version of the binary."""
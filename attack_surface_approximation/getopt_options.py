@@ -0,0 +1,41 @@
+import typing
+
+# Arities of the options, as in getopt.h
+NO_ARGUMENT = 0
+REQUIRED_ARGUMENT = 1
+OPTIONAL_ARGUMENT = 2
+ARITIES = [NO_ARGUMENT, REQUIRED_ARGUMENT, OPTIONAL_ARGUMENT]
+
+OPTSTRING_MODE_CHARACTERS = "+-:"
+
+# An option and its arity, if known
+HarvestedOption = typing.Tuple[str, typing.Optional[int]]
+
+
+def decode_optstring(optstring: str) -> typing.List[HarvestedOption]:
+    options = []
+
+    index = 0
+    while index < len(optstring) and (
+        optstring[index] in OPTSTRING_MODE_CHARACTERS
+    ):
+        index += 1
+
+    while index < len(optstring):
+        option = optstring[index]
+        index += 1
+
+        # "W;" makes -W foo an alias of --foo, so it is no option itself.
+        if option == "W" and optstring[index : index + 1] == ";":
+            index += 1
+            continue
+
+        colons_count = 0
+        while optstring[index : index + 1] == ":" and colons_count < 2:
+            colons_count += 1
+            index += 1
+
+        if option != ":":
+            options.append(("-" + option, colons_count))
+
+    return options
@@ -0,0 +1,183 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import typing
+
+from attack_surface_approximation.configuration import Configuration
+from attack_surface_approximation.exceptions import (
+    GhidraNotFoundException,
+    MainNotFoundException,
+    StaticAnalysisFailedException,
+)
+from attack_surface_approximation.tracing import traced
+
+PROJECT_NAME = "batch"
+POST_SCRIPT = "ExportCallsAndMain.py"
+OUTPUT_FILENAME = "analyses.jsonl"
+IMPORTS_FOLDER = "imports"
+COMMENTS_PATTERN = r"/\*.*?\*/"
+
+# Ghidra's built-in types, that are unknown to a C parser
+GHIDRA_TYPEDEFS = """
+typedef unsigned char undefined;
+typedef unsigned char undefined1;
+typedef unsigned short undefined2;
+typedef unsigned int undefined3;
+typedef unsigned int undefined4;
+typedef unsigned long long undefined5;
+typedef unsigned long long undefined6;
+typedef unsigned long long undefined7;
+typedef unsigned long long undefined8;
+typedef unsigned char byte;
+typedef unsigned char uchar;
+typedef unsigned short ushort;
+typedef unsigned short word;
+typedef unsigned int uint;
+typedef unsigned int dword;
+typedef unsigned long ulong;
+typedef long long longlong;
+typedef unsigned long long ulonglong;
+typedef unsigned long long qword;
+typedef unsigned char bool;
+typedef void code;
+"""
+
+
+class BatchedGhidraResult:
+    filename: str
+    __calls: typing.List[str]
+    __main_decompilation: typing.Optional[str]
+
+    def __init__(
+        self,
+        filename: str,
+        calls: typing.List[str],
+        main_decompilation: typing.Optional[str],
+    ) -> None:
+        self.filename = filename
+        self.__calls = calls
+        self.__main_decompilation = main_decompilation
+
+    def extract_calls(self) -> typing.List[str]:
+        return self.__calls
+
+    def decompile_function(self, function_name: str) -> str:
+        # Only main() is exported by the post-script.
+        if function_name != "main" or self.__main_decompilation is None:
+            raise MainNotFoundException()
+
+        decompilation = re.sub(
+            COMMENTS_PATTERN, "", self.__main_decompilation, flags=re.DOTALL
+        )
+
+        return GHIDRA_TYPEDEFS + decompilation
+
+
+class BatchedGhidraAnalysis:
+    __configuration: object = Configuration.GhidraDecompilation
+    filenames: typing.List[str]
+    __results: typing.Dict[str, BatchedGhidraResult]
+    __imported_names: typing.Dict[str, str]
+
+    def __init__(self, filenames: typing.List[str]) -> None:
+        self.filenames = filenames
+        self.__results = {}
+        self.__imported_names = {}
+
+        if self.filenames:
+            self.__run()
+
+    @staticmethod
+    def __get_key(filename: str) -> str:
+        return os.path.realpath(filename)
+
+    def __link_imports(self, imports_folder: str) -> typing.List[str]:
+        # The programs of a project are named after the imported files, so
+        # executables with the same basename are imported under unique names.
+        imported_filenames = []
+        for index, filename in enumerate(self.filenames):
+            imported_name = f"{index}_{os.path.basename(filename)}"
+            imported_filename = os.path.join(imports_folder, imported_name)
+
+            try:
+                os.link(filename, imported_filename)
+            except OSError:
+                shutil.copyfile(filename, imported_filename)
+
+            self.__imported_names[imported_name] = self.__get_key(filename)
+            imported_filenames.append(imported_filename)
+
+        return imported_filenames
+
+    def __build_command(
+        self,
+        project_folder: str,
+        imported_filenames: typing.List[str],
+        output_filename: str,
+    ) -> typing.List[str]:
+        scripts_folder = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "ghidra_scripts"
+        )
+
+        return [
+            self.__configuration.HEADLESS_ANALYZER,
+            project_folder,
+            PROJECT_NAME,
+            "-import",
+            *imported_filenames,
+            "-scriptPath",
+            scripts_folder,
+            "-postScript",
+            POST_SCRIPT,
+            output_filename,
+            "-deleteProject",
+        ]
+
+    @traced("BatchedGhidraAnalysis.run")
+    def __run(self) -> None:
+        # A single headless analyzer (hence a single JVM and project) imports
+        # all the executables and runs the post-script on each of them.
+        with tempfile.TemporaryDirectory() as project_folder:
+            output_filename = os.path.join(project_folder, OUTPUT_FILENAME)
+            imports_folder = os.path.join(project_folder, IMPORTS_FOLDER)
+            os.mkdir(imports_folder)
+
+            command = self.__build_command(
+                project_folder,
+                self.__link_imports(imports_folder),
+                output_filename,
+            )
+
+            try:
+                subprocess.run(
+                    command,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    check=False,
+                )
+            except FileNotFoundError as exception:
+                raise GhidraNotFoundException() from exception
+
+            if os.path.isfile(output_filename):
+                self.__parse_output(output_filename)
+
+    def __parse_output(self, output_filename: str) -> None:
+        with open(output_filename, "r", encoding="utf-8") as output_file:
+            for line in output_file:
+                entry = json.loads(line)
+                key = self.__imported_names.get(entry["name"])
+                if key is None:
+                    continue
+
+                self.__results[key] = BatchedGhidraResult(
+                    key, entry["calls"], entry["main"]
+                )
+
+    def get_analysis(self, filename: str) -> BatchedGhidraResult:
+        try:
+            return self.__results[self.__get_key(filename)]
+        except KeyError as exception:
+            raise StaticAnalysisFailedException() from exception
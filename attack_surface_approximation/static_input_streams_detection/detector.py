@@ -6,9 +6,16 @@ from pycparser import c_parser
 
 from attack_surface_approximation.configuration import Configuration
 from attack_surface_approximation.exceptions import (
+    DecompilationParsingException,
     ELFNotFoundException,
+    InputStreamsDetectorException,
     NotELFFileException,
 )
+from attack_surface_approximation.static_input_streams_detection.batched_ghidra import (
+    BatchedGhidraAnalysis,
+    BatchedGhidraResult,
+)
+from attack_surface_approximation.tracing import trace_span, traced
 from commons.ghidra import GhidraAnalysis
 from commons.input_streams import InputStreams
 
@@ -66,21 +73,73 @@ class InputStreamsDetector:
     __calls: typing.List[str]
     __main_decompilation: str
 
-    def __init__(self, filename: str) -> None:
-        if os.path.isfile(filename):
-            given_file = open(filename, "rb")
+    def __init__(
+        self,
+        filename: str,
+        analysis: typing.Optional[
+            typing.Union[GhidraAnalysis, BatchedGhidraResult]
+        ] = None,
+    ) -> None:
+        with trace_span("InputStreamsDetector.__init__", elf=filename):
+            with trace_span("InputStreamsDetector.check_elf"):
+                self.__check_elf(filename)
+            self.__filename = filename
+
+            # The analysis can be precomputed, for example by a batched run.
+            if analysis is None:
+                with trace_span("ghidra.create_analysis"):
+                    analysis = GhidraAnalysis(self.__filename)
+
+            with trace_span("ghidra.extract_calls"):
+                self.__calls = list(analysis.extract_calls())
+            with trace_span("ghidra.decompile_main"):
+                self.__main_decompilation = analysis.decompile_function(
+                    MAIN_FUNCTION_NAME
+                )
+
+    @staticmethod
+    def __check_elf(filename: str) -> None:
+        if not os.path.isfile(filename):
+            raise ELFNotFoundException()
+
+        with open(filename, "rb") as given_file:
             try:
                 ELFFile(given_file)
             except ELFError as exception:
                 raise NotELFFileException() from exception
 
-            self.__filename = filename
-        else:
-            raise ELFNotFoundException()
+    @staticmethod
+    def create_batch(
+        filenames: typing.List[str],
+    ) -> typing.Tuple[
+        typing.Dict[str, "InputStreamsDetector"],
+        typing.Dict[str, InputStreamsDetectorException],
+    ]:
+        detectors = {}
+        failures = {}
+
+        # A binary that can not be analyzed is recorded as failed, without
+        # losing the results of the other ones.
+        valid_filenames = []
+        for filename in filenames:
+            try:
+                InputStreamsDetector.__check_elf(filename)
+            except InputStreamsDetectorException as exception:
+                failures[filename] = exception
+            else:
+                valid_filenames.append(filename)
 
-        analysis = GhidraAnalysis(self.__filename)
-        self.__calls = list(analysis.extract_calls())
-        self.__main_decompilation = analysis.decompile_function("main")
+        batch_analysis = BatchedGhidraAnalysis(valid_filenames)
+
+        for filename in valid_filenames:
+            try:
+                detectors[filename] = InputStreamsDetector(
+                    filename, batch_analysis.get_analysis(filename)
+                )
+            except InputStreamsDetectorException as exception:
+                failures[filename] = exception
+
+        return detectors, failures
 
     @staticmethod
     def __have_element_in_common(first: set, second: set) -> True:
@@ -115,11 +174,16 @@ class InputStreamsDetector:
         )
 
     def uses_arguments(self) -> bool:
-        parser = c_parser.CParser()
-        ast = parser.parse(self.__main_decompilation)
+        with trace_span("pycparser.parse"):
+            parser = c_parser.CParser()
+            try:
+                ast = parser.parse(self.__main_decompilation)
+            except c_parser.ParseError as exception:
+                raise DecompilationParsingException() from exception
 
-        visitor = ParametersCheckVisitor()
-        visitor.visit(ast)
+        with trace_span("InputStreamsDetector.visit_main"):
+            visitor = ParametersCheckVisitor()
+            visitor.visit(ast)
 
         return visitor.are_parameters_used()
 
@@ -139,5 +203,6 @@ class InputStreamsDetector:
         if self.uses_networking():
             yield InputStreams.NETWORKING
 
+    @traced("InputStreamsDetector.detect_all")
     def detect_all(self) -> typing.List[InputStreams]:
         return list(self.__detect_all())
@@ -0,0 +1,53 @@
+# Appends the called functions and the decompilation of main() of the current
+# program, as a JSON line, to the file given as the first script argument.
+# @category OpenCRS
+
+import json
+
+from ghidra.app.decompiler import DecompInterface
+
+MAIN_FUNCTION_NAME = "main"
+DECOMPILATION_TIMEOUT = 60
+
+
+def get_calls():
+    calls = set()
+    for function in currentProgram.getFunctionManager().getFunctions(True):
+        for called_function in function.getCalledFunctions(monitor):
+            calls.add(called_function.getName())
+
+    return sorted(calls)
+
+
+def decompile_main():
+    functions = getGlobalFunctions(MAIN_FUNCTION_NAME)
+    if not functions:
+        return None
+
+    decompiler = DecompInterface()
+    decompiler.openProgram(currentProgram)
+    results = decompiler.decompileFunction(
+        functions[0], DECOMPILATION_TIMEOUT, monitor
+    )
+    decompiler.dispose()
+
+    if not results.decompileCompleted():
+        return None
+
+    return results.getDecompiledFunction().getC()
+
+
+def main():
+    output_filename = getScriptArgs()[0]
+    entry = {
+        "name": currentProgram.getName(),
+        "path": currentProgram.getExecutablePath(),
+        "calls": get_calls(),
+        "main": decompile_main(),
+    }
+
+    with open(output_filename, "a") as output_file:
+        output_file.write(json.dumps(entry) + "\n")
+
+
+main()
@@ -0,0 +1,154 @@
+import contextlib
+import functools
+import json
+import os
+import re
+import threading
+import time
+import typing
+
+PROFILE_FILENAME_UNSAFE_CHARACTERS = r"[^\w.-]+"
+
+
+class Tracer:
+    filename: typing.Optional[str]
+    profiles_folder: typing.Optional[str]
+    events: typing.List[dict]
+    __start_time: float
+    __is_profiling: bool
+    __profiles_count: int
+
+    def __init__(
+        self,
+        filename: typing.Optional[str] = None,
+        profiles_folder: typing.Optional[str] = None,
+    ) -> None:
+        self.filename = filename
+        self.profiles_folder = profiles_folder
+        self.events = []
+        self.__start_time = time.perf_counter()
+        self.__is_profiling = False
+        self.__profiles_count = 0
+
+        if self.profiles_folder:
+            os.makedirs(self.profiles_folder, exist_ok=True)
+
+    def __get_timestamp(self) -> float:
+        # Chrome traces use microseconds.
+        return (time.perf_counter() - self.__start_time) * 1e6
+
+    def __start_profiler(self) -> typing.Optional[object]:
+        # cProfile does not support nested profilers, so only the outermost
+        # profiled span of a nesting is dumped.
+        if not self.profiles_folder or self.__is_profiling:
+            return None
+
+        import cProfile  # pylint: disable=import-outside-toplevel
+
+        self.__is_profiling = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        return profiler
+
+    def __stop_profiler(self, profiler: object, name: str) -> None:
+        profiler.disable()
+        self.__is_profiling = False
+
+        safe_name = re.sub(PROFILE_FILENAME_UNSAFE_CHARACTERS, "_", name)
+        profile_filename = os.path.join(
+            self.profiles_folder,
+            f"{self.__profiles_count:04d}-{safe_name}.prof",
+        )
+        profiler.dump_stats(profile_filename)
+        self.__profiles_count += 1
+
+    @contextlib.contextmanager
+    def span(
+        self, name: str, profile: bool = True, **arguments: typing.Any
+    ) -> typing.Generator[None, None, None]:
+        profiler = self.__start_profiler() if profile else None
+        start_timestamp = self.__get_timestamp()
+
+        try:
+            yield
+        finally:
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": "phase",
+                    "ph": "X",
+                    "ts": start_timestamp,
+                    "dur": self.__get_timestamp() - start_timestamp,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": {
+                        key: str(value) for key, value in arguments.items()
+                    },
+                }
+            )
+
+            if profiler:
+                self.__stop_profiler(profiler, name)
+
+    def dump(self) -> None:
+        if not self.filename:
+            return
+
+        with open(self.filename, "w", encoding="utf-8") as trace_file:
+            json.dump(
+                {"traceEvents": self.events, "displayTimeUnit": "ms"},
+                trace_file,
+            )
+
+
+class TracingState:
+    active_tracer: typing.Optional[Tracer] = None
+
+
+def start_tracing(
+    filename: typing.Optional[str] = None,
+    profiles_folder: typing.Optional[str] = None,
+) -> Tracer:
+    TracingState.active_tracer = Tracer(filename, profiles_folder)
+
+    return TracingState.active_tracer
+
+
+def stop_tracing() -> None:
+    if TracingState.active_tracer:
+        TracingState.active_tracer.dump()
+        TracingState.active_tracer = None
+
+
+@contextlib.contextmanager
+def tracing(
+    filename: typing.Optional[str] = None,
+    profiles_folder: typing.Optional[str] = None,
+) -> typing.Generator[Tracer, None, None]:
+    tracer = start_tracing(filename, profiles_folder)
+    try:
+        yield tracer
+    finally:
+        stop_tracing()
+
+
+def trace_span(
+    name: str, profile: bool = True, **arguments: typing.Any
+) -> typing.ContextManager:
+    if TracingState.active_tracer is None:
+        return contextlib.nullcontext()
+
+    return TracingState.active_tracer.span(name, profile=profile, **arguments)
+
+
+def traced(name: str) -> typing.Callable:
+    def decorator(function: typing.Callable) -> typing.Callable:
+        @functools.wraps(function)
+        def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            with trace_span(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
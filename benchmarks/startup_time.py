@@ -0,0 +1,120 @@
+"""Checks the import time of each CLI subcommand against a startup budget.
+
+Each subcommand is started with `--help` under `python -X importtime`, such
+that only the imports are measured. The heavy subsystems must not be imported
+at all, as they are only needed when a command actually runs.
+
+Usage: python benchmarks/startup_time.py
+"""
+
+import subprocess
+import sys
+import typing
+
+REPEATS = 5
+CLI_MODULE = "attack_surface_approximation.cli"
+HEAVY_MODULES = ["docker", "pycparser", "elftools", "rich"]
+
+# Budgets in milliseconds, for the imports not done by a bare interpreter
+STARTUP_BUDGETS = {
+    "": 100,
+    "generate": 100,
+    "detect": 100,
+    "detect-batch": 100,
+    "fuzz": 100,
+    "analyze": 100,
+    "worker": 100,
+    "export-log": 100,
+    "rescan": 100,
+    "fuzz-env": 100,
+}
+
+
+def run_with_import_time(arguments: typing.List[str]) -> str:
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *arguments],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+
+    return process.stderr
+
+
+def parse_import_time(
+    output: str,
+) -> typing.Tuple[typing.Dict[str, int], typing.Set[str]]:
+    top_level_imports = {}
+    all_imports = set()
+
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        module = name.strip()
+        all_imports.add(module)
+
+        if not name[1:].startswith(" "):
+            top_level_imports[module] = int(cumulative)
+
+    return top_level_imports, all_imports
+
+
+def measure_subcommand(
+    subcommand: str, baseline_imports: typing.Set[str]
+) -> typing.Tuple[float, typing.Set[str]]:
+    arguments = ["-m", CLI_MODULE, *([subcommand] if subcommand else [])]
+    arguments.append("--help")
+
+    durations = []
+    for _ in range(REPEATS):
+        top_level_imports, all_imports = parse_import_time(
+            run_with_import_time(arguments)
+        )
+        durations.append(
+            sum(
+                cumulative
+                for module, cumulative in top_level_imports.items()
+                if module not in baseline_imports
+            )
+        )
+
+    heavy_imports = {
+        module
+        for module in all_imports
+        if module.split(".")[0] in HEAVY_MODULES
+    }
+
+    return min(durations) / 1000, heavy_imports
+
+
+def main() -> int:
+    _, baseline_imports = parse_import_time(
+        run_with_import_time(["-c", "pass"])
+    )
+
+    failures = 0
+    for subcommand, budget in STARTUP_BUDGETS.items():
+        duration, heavy_imports = measure_subcommand(
+            subcommand, baseline_imports
+        )
+        heavy_roots = sorted(
+            {module.split(".")[0] for module in heavy_imports}
+        )
+
+        is_failed = duration > budget or bool(heavy_roots)
+        failures += is_failed
+
+        print(
+            f"{subcommand or '(root)':<14} {duration:8.1f} ms / {budget} ms"
+            f"  {'FAIL' if is_failed else 'OK'}"
+            + (f" (imports {', '.join(heavy_roots)})" if heavy_roots else "")
+        )
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
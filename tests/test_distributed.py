@@ -0,0 +1,103 @@
+import sys
+import typing
+import zlib
+
+import pytest
+
+from attack_surface_approximation.arguments_fuzzing import (
+    ArgumentsFuzzer,
+    ArgumentsPair,
+    FuzzingCoordinator,
+    FuzzingWorker,
+    LocalWorkers,
+)
+from attack_surface_approximation.arguments_fuzzing.fuzzer import (
+    CANARY_STRING,
+)
+from attack_surface_approximation.arguments_fuzzing.qbdi_analysis import (
+    QBDIAnalysisResult,
+)
+
+AUTHKEY = b"opencrs-test"
+CANARY_FILENAME = "/tmp/canary.opencrs"
+DICTIONARY = ["-a", "-b", "-c", "--verbose", "-f", "-o", "-s", "-x", "-y"]
+
+# Command lines whose coverage differs from the baseline one. The flags -a and
+# -y, in different shards, share the same coverage, so only the first one is
+# valid.
+COVERAGES = {
+    "-a": "A",
+    "-y": "A",
+    "--verbose": "V",
+    "-s": "S",
+    "-x": "X",
+    f"-x {CANARY_STRING}": "XS",
+}
+FILE_ENABLERS = {"-f", "-o"}
+
+
+class FakeAnalysis:
+    timeout: float
+    executions: int
+
+    def __init__(self) -> None:
+        self.timeout = 1
+        self.executions = 0
+
+    def create_temp_file_inside_container(self) -> str:
+        return CANARY_FILENAME
+
+    def analyze(
+        self,
+        argument: ArgumentsPair,
+        timeout_retry: bool = False,
+        environment: typing.Optional[typing.Dict[str, str]] = None,
+    ) -> QBDIAnalysisResult:
+        self.executions += 1
+        command_line = argument.to_str()
+        if argument.first in FILE_ENABLERS and argument.second:
+            coverage = "F" + argument.first
+        else:
+            coverage = COVERAGES.get(command_line, "baseline")
+
+        return QBDIAnalysisResult(
+            1,
+            zlib.crc32(coverage.encode()),
+            CANARY_FILENAME in command_line and coverage != "baseline",
+            0,
+            False,
+            0.01,
+        )
+
+
+class FakeWorker(FuzzingWorker):
+    def create_analysis(
+        self, executable_filename: str, host_folder: str
+    ) -> FakeAnalysis:
+        return FakeAnalysis()
+
+
+def describe(
+    arguments: typing.List[ArgumentsPair],
+) -> typing.List[tuple]:
+    return [
+        (type(argument).__name__, argument.to_str(), argument.valid_roles)
+        for argument in arguments
+    ]
+
+
+@pytest.mark.parametrize("workers_count", [1, 2, 3, 5])
+def test_distributed_fuzzing_matches_sequential_one(
+    workers_count: int,
+) -> None:
+    sequential_fuzzer = ArgumentsFuzzer(
+        sys.executable, DICTIONARY, analysis=FakeAnalysis()
+    )
+    sequential_arguments = sequential_fuzzer.get_all_valid_arguments()
+
+    with LocalWorkers(workers_count, AUTHKEY, FakeWorker) as workers:
+        coordinator = FuzzingCoordinator(workers.addresses, AUTHKEY)
+        distributed_arguments = coordinator.fuzz(sys.executable, DICTIONARY)
+
+    assert sequential_arguments
+    assert describe(distributed_arguments) == describe(sequential_arguments)